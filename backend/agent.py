@@ -9,22 +9,146 @@ Spec Reference: specs/subagents/todo_agent.md
 """
 
 import asyncio
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import atexit
+import threading
+import weakref
+from collections import defaultdict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 
 from agents import Agent, Runner, function_tool
-from sqlmodel import Session, select
+from cachetools import TTLCache
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.cache import (
+    TASK_STATUSES,
+    acquire_fill_lock,
+    append_conversation_messages,
+    get_conversation_history,
+    get_task_list,
+    get_task_list_version,
+    hold_conversation_lock,
+    invalidate_task_lists,
+    open_loop_client,
+    release_fill_lock,
+    set_conversation_history,
+    set_task_list,
+    task_list_key,
+    wait_for_task_list,
+)
+from backend.database.connection import AsyncSessionLocal, create_async_db_engine
+from backend.models.todo_models import Task, TaskStatus, Message, MessageRole
+
+
+# Message role -> role string sent to the model (only assistant is kept apart)
+_ROLE_STR = {
+    role: "assistant" if role == MessageRole.assistant else "user"
+    for role in MessageRole
+}
+
+# Status string -> enum, avoiding TaskStatus(...) lookups and ValueError handling
+_STATUS_MAP = {s.value: s for s in TaskStatus}
 
-from backend.database.connection import engine
-from backend.models.todo_models import Task, TaskStatus, Message, MessageRole, Conversation
+
+# =============================================================================
+# Process-local L1 cache (checked before Redis)
+# =============================================================================
+
+# Kept shorter-lived than the Redis TTL so other processes' writes age out
+_L1: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_L1_LOCK = threading.Lock()
+# user_id -> number of in-process invalidations; a listing read before one
+# must not be put back into L1 after it
+_L1_GENERATION: Dict[int, int] = defaultdict(int)
+
+
+def _l1_get(key: tuple) -> Any:
+    with _L1_LOCK:
+        return _L1.get(key)
+
+
+def _l1_generation(user_id: int) -> int:
+    with _L1_LOCK:
+        return _L1_GENERATION[user_id]
+
+
+def _l1_set_tasks(user_id: int, status: str, generation: int, task_list: List[Dict[str, Any]]) -> None:
+    """Cache a listing in L1 unless the user's tasks changed since generation."""
+    with _L1_LOCK:
+        if _L1_GENERATION[user_id] == generation:
+            _L1[("tasks", user_id, status)] = task_list
+
+
+async def _invalidate_user_tasks(user_id: int) -> None:
+    """
+    Drop a user's cached task listings from both L1 and Redis.
+    """
+    with _L1_LOCK:
+        _L1_GENERATION[user_id] += 1
+        for status in TASK_STATUSES:
+            _L1.pop(("tasks", user_id, status), None)
+    await invalidate_task_lists(user_id)
+
+
+# =============================================================================
+# Background event loop for run_sync
+# =============================================================================
+
+# Event loop used by run_sync; created once and run on a daemon thread. It
+# gets its own database engine and Redis client (see _session and
+# cache.open_loop_client): async connections belong to the loop that opened
+# them, so the app's pools can't be shared with it
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+_LOOP_SESSIONS: Optional[async_sessionmaker] = None
+# run_sync callers wait on their result, so a few connections are plenty
+LOOP_POOL_SIZE = 2
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop for synchronous callers, starting it
+    on first use.
+    """
+    global _LOOP, _LOOP_SESSIONS
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            _LOOP_SESSIONS = async_sessionmaker(
+                bind=create_async_db_engine(pool_size=LOOP_POOL_SIZE, max_overflow=0),
+                class_=AsyncSession,
+                expire_on_commit=False
+            )
+            open_loop_client(loop)
+            threading.Thread(target=loop.run_forever, name="todo-agent-loop", daemon=True).start()
+            atexit.register(loop.call_soon_threadsafe, loop.stop)
+            _LOOP = loop
+        return _LOOP
+
+
+def _session() -> AsyncSession:
+    """Open a session on the engine that belongs to the running event loop."""
+    if _LOOP is not None and asyncio.get_running_loop() is _LOOP:
+        return _LOOP_SESSIONS()
+    return AsyncSessionLocal()
 
 
 # =============================================================================
 # Tool Definitions (wrapping todo_mcp functions for OpenAI Agents SDK)
 # =============================================================================
+#
+# The mutating tools (complete/update/delete) are a single UPDATE or DELETE
+# filtered on both id and user_id with RETURNING. Authorization and the write
+# happen atomically in that one statement, so there is no read-then-write
+# window for concurrent agent turns to race in, and no row lock is held
+# across a separate SELECT. Task ids and user ids are bound parameters, so
+# SQLAlchemy's compiled-statement cache reuses the SQL for every call.
 
 @function_tool
-def add_task(user_id: str, title: str, description: str = "") -> dict:
+async def add_task(user_id: str, title: str, description: str = "") -> dict:
     """
     Create a new task for the user's todo list.
 
@@ -36,7 +160,7 @@ def add_task(user_id: str, title: str, description: str = "") -> dict:
     Returns:
         JSON object containing task_id, status, and title
     """
-    with Session(engine) as session:
+    async with _session() as session:
         try:
             user_id_int = int(user_id)
         except ValueError:
@@ -50,8 +174,8 @@ def add_task(user_id: str, title: str, description: str = "") -> dict:
                 status=TaskStatus.pending
             )
             session.add(task)
-            session.commit()
-            session.refresh(task)
+            await session.commit()
+            await _invalidate_user_tasks(user_id_int)
 
             return {
                 "task_id": task.id,
@@ -59,12 +183,12 @@ def add_task(user_id: str, title: str, description: str = "") -> dict:
                 "title": task.title
             }
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             return {"error": str(e), "status": "error"}
 
 
 @function_tool
-def list_tasks(user_id: str, status: str = "all") -> dict:
+async def list_tasks(user_id: str, status: str = "all") -> dict:
     """
     Retrieve tasks from the user's todo list.
 
@@ -75,45 +199,78 @@ def list_tasks(user_id: str, status: str = "all") -> dict:
     Returns:
         Array of task objects
     """
-    with Session(engine) as session:
-        try:
-            user_id_int = int(user_id)
-        except ValueError:
-            return {"error": f"Invalid user_id: {user_id}", "tasks": []}
-
-        try:
-            query = select(Task).where(Task.user_id == user_id_int)
-
-            if status != "all":
-                try:
-                    status_enum = TaskStatus(status)
-                    query = query.where(Task.status == status_enum)
-                except ValueError:
-                    return {
-                        "error": f"Invalid status: {status}. Use 'all', 'pending', or 'completed'",
-                        "tasks": []
-                    }
-
-            tasks = session.exec(query).all()
-
-            task_list = []
-            for task in tasks:
-                task_list.append({
-                    "task_id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status.value,
-                    "created_at": task.created_at.isoformat() if task.created_at else None
-                })
-
-            return {"tasks": task_list}
-
-        except Exception as e:
-            return {"error": str(e), "tasks": []}
+    try:
+        user_id_int = int(user_id)
+    except ValueError:
+        return {"error": f"Invalid user_id: {user_id}", "tasks": []}
+
+    # Project only the columns the tool returns; rows come back as tuples
+    query = select(
+        Task.id, Task.title, Task.description, Task.status, Task.created_at
+    ).where(Task.user_id == user_id_int)
+
+    if status != "all":
+        status_enum = _STATUS_MAP.get(status)
+        if status_enum is None:
+            return {
+                "error": f"Invalid status: {status}. Use 'all', 'pending', or 'completed'",
+                "tasks": []
+            }
+        query = query.where(Task.status == status_enum)
+
+    # Cache-aside: serve repeat listings from L1, then Redis
+    cached = _l1_get(("tasks", user_id_int, status))
+    if cached is not None:
+        return {"tasks": cached}
+
+    # Take both versions before reading, so a mutation committed meanwhile
+    # leaves the result in an abandoned Redis key and out of L1
+    generation = _l1_generation(user_id_int)
+    version = await get_task_list_version(user_id_int)
+    if version is not None:
+        cached = await get_task_list(user_id_int, status, version)
+        if cached is not None:
+            _l1_set_tasks(user_id_int, status, generation, cached)
+            return {"tasks": cached}
+
+    # Only one caller refills a missing key; the others wait for it
+    cache_key = task_list_key(user_id_int, status, version) if version is not None else None
+    locked = await acquire_fill_lock(cache_key) if cache_key is not None else False
+    if cache_key is not None and not locked:
+        cached = await wait_for_task_list(user_id_int, status, version)
+        if cached is not None:
+            _l1_set_tasks(user_id_int, status, generation, cached)
+            return {"tasks": cached}
+
+    try:
+        async with _session() as session:
+            rows = (await session.exec(query)).all()
+
+            task_list = [
+                {
+                    "task_id": task_id,
+                    "title": title,
+                    "description": description,
+                    "status": task_status.value,
+                    "created_at": created_at.isoformat() if created_at else None
+                }
+                for task_id, title, description, task_status, created_at in rows
+            ]
+
+        if version is not None:
+            await set_task_list(user_id_int, status, version, task_list)
+        _l1_set_tasks(user_id_int, status, generation, task_list)
+        return {"tasks": task_list}
+
+    except Exception as e:
+        return {"error": str(e), "tasks": []}
+    finally:
+        if locked:
+            await release_fill_lock(cache_key)
 
 
 @function_tool
-def complete_task(user_id: str, task_id: int) -> dict:
+async def complete_task(user_id: str, task_id: int) -> dict:
     """
     Mark a task as complete.
 
@@ -124,33 +281,40 @@ def complete_task(user_id: str, task_id: int) -> dict:
     Returns:
         JSON object with status: "completed"
     """
-    with Session(engine) as session:
-        try:
-            user_id_int = int(user_id)
-        except ValueError:
-            return {"status": "error", "error": f"Invalid user_id: {user_id}"}
-
-        task = session.get(Task, task_id)
-        if not task or task.user_id != user_id_int:
-            return {
-                "status": "error",
-                "error": f"Task with ID {task_id} not found for user {user_id}"
-            }
+    try:
+        user_id_int = int(user_id)
+    except ValueError:
+        return {"status": "error", "error": f"Invalid user_id: {user_id}"}
+
+    # No row returned means the task doesn't exist or isn't this user's
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id_int)
+        .values(status=TaskStatus.completed)
+        .returning(Task.id)
+    )
 
+    async with _session() as session:
         try:
-            task.status = TaskStatus.completed
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            session.commit()
-
-            return {"status": "completed", "task_id": task.id}
+            row = (await session.execute(statement)).first()
+            if row is None:
+                await session.rollback()
+                return {
+                    "status": "error",
+                    "error": f"Task with ID {task_id} not found for user {user_id}"
+                }
+
+            await session.commit()
+            await _invalidate_user_tasks(user_id_int)
+
+            return {"status": "completed", "task_id": row.id}
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             return {"status": "error", "error": str(e)}
 
 
 @function_tool
-def delete_task(user_id: str, task_id: int) -> dict:
+async def delete_task(user_id: str, task_id: int) -> dict:
     """
     Remove a task from the todo list.
 
@@ -161,30 +325,37 @@ def delete_task(user_id: str, task_id: int) -> dict:
     Returns:
         JSON object with status: "deleted"
     """
-    with Session(engine) as session:
-        try:
-            user_id_int = int(user_id)
-        except ValueError:
-            return {"status": "error", "error": f"Invalid user_id: {user_id}"}
-
-        task = session.get(Task, task_id)
-        if not task or task.user_id != user_id_int:
-            return {
-                "status": "error",
-                "error": f"Task with ID {task_id} not found for user {user_id}"
-            }
+    try:
+        user_id_int = int(user_id)
+    except ValueError:
+        return {"status": "error", "error": f"Invalid user_id: {user_id}"}
+
+    statement = (
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user_id_int)
+        .returning(Task.id)
+    )
 
+    async with _session() as session:
         try:
-            session.delete(task)
-            session.commit()
+            row = (await session.execute(statement)).first()
+            if row is None:
+                await session.rollback()
+                return {
+                    "status": "error",
+                    "error": f"Task with ID {task_id} not found for user {user_id}"
+                }
+
+            await session.commit()
+            await _invalidate_user_tasks(user_id_int)
             return {"status": "deleted", "task_id": task_id}
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             return {"status": "error", "error": str(e)}
 
 
 @function_tool
-def update_task(
+async def update_task(
     user_id: str,
     task_id: int,
     title: Optional[str] = None,
@@ -200,40 +371,51 @@ def update_task(
         description: New description for the task (optional)
 
     Returns:
-        JSON object with status: "updated"
+        JSON object with status: "updated", or "noop" if no fields were given
     """
-    with Session(engine) as session:
-        try:
-            user_id_int = int(user_id)
-        except ValueError:
-            return {"status": "error", "error": f"Invalid user_id: {user_id}"}
-
-        task = session.get(Task, task_id)
-        if not task or task.user_id != user_id_int:
-            return {
-                "status": "error",
-                "error": f"Task with ID {task_id} not found for user {user_id}"
-            }
+    try:
+        user_id_int = int(user_id)
+    except ValueError:
+        return {"status": "error", "error": f"Invalid user_id: {user_id}"}
+
+    values = {}
+    if title is not None:
+        values["title"] = title
+    if description is not None:
+        values["description"] = description
+
+    # Nothing to change: skip the round-trip and the updated_at bump
+    if not values:
+        return {"status": "noop", "task_id": task_id}
+
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id_int)
+        .values(**values)
+        .returning(Task.id, Task.title, Task.description)
+    )
 
+    async with _session() as session:
         try:
-            if title is not None:
-                task.title = title
-            if description is not None:
-                task.description = description
+            row = (await session.execute(statement)).first()
+            if row is None:
+                await session.rollback()
+                return {
+                    "status": "error",
+                    "error": f"Task with ID {task_id} not found for user {user_id}"
+                }
 
-            task.updated_at = datetime.utcnow()
-            session.add(task)
-            session.commit()
-            session.refresh(task)
+            await session.commit()
+            await _invalidate_user_tasks(user_id_int)
 
             return {
                 "status": "updated",
-                "task_id": task.id,
-                "title": task.title,
-                "description": task.description
+                "task_id": row.id,
+                "title": row.title,
+                "description": row.description
             }
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             return {"status": "error", "error": str(e)}
 
 
@@ -279,6 +461,24 @@ AGENT_INSTRUCTIONS = """You are a Personal Task Assistant, an AI capable of mana
 # Agent Factory and Runner
 # =============================================================================
 
+# Per-(loop, conversation) locks, since an asyncio.Lock can only be used on
+# one loop; turns on the app's loop and run_sync's background loop are still
+# serialized by the Redis lock. Entries disappear once no turn holds a reference
+_CONV_LOCKS: "weakref.WeakValueDictionary[Tuple[asyncio.AbstractEventLoop, int], asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _conversation_lock(conversation_id: int) -> asyncio.Lock:
+    """Return the in-process lock for a conversation, creating it if needed."""
+    key = (asyncio.get_running_loop(), conversation_id)
+    lock = _CONV_LOCKS.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _CONV_LOCKS[key] = lock
+    return lock
+
+
 def create_todo_agent() -> Agent:
     """
     Create and configure the Personal Task Assistant agent.
@@ -294,6 +494,20 @@ def create_todo_agent() -> Agent:
     )
 
 
+@lru_cache(maxsize=1)
+def get_todo_agent() -> Agent:
+    """
+    Return the shared Personal Task Assistant agent, building it on first use.
+
+    The agent holds no per-user state (user_id travels in the run context),
+    so one instance serves every runner.
+
+    Returns:
+        Agent: The process-wide agent instance
+    """
+    return create_todo_agent()
+
+
 class TodoAgentRunner:
     """
     Runner class for executing the Todo Agent with conversation persistence.
@@ -313,11 +527,11 @@ class TodoAgentRunner:
             user_id: The ID of the user this agent is serving
         """
         self.user_id = user_id
-        self.agent = create_todo_agent()
+        self.agent = get_todo_agent()
 
-    def load_conversation_history(self, conversation_id: int) -> List[Dict[str, str]]:
+    async def load_conversation_history(self, conversation_id: int) -> List[Dict[str, str]]:
         """
-        Load conversation history from the database.
+        Load conversation history, from Redis when cached, else the database.
 
         Args:
             conversation_id: The ID of the conversation
@@ -325,23 +539,26 @@ class TodoAgentRunner:
         Returns:
             List of message dicts formatted for the agent
         """
-        with Session(engine) as session:
-            statement = select(Message).where(
+        cached = await get_conversation_history(conversation_id)
+        if cached is not None:
+            return cached
+
+        async with _session() as session:
+            # Only role and content are needed, so skip ORM hydration
+            statement = select(Message.role, Message.content).where(
                 Message.conversation_id == conversation_id
-            ).order_by(Message.created_at)
-            messages = session.exec(statement).all()
+            ).order_by(Message.created_at, Message.id)
+            rows = (await session.exec(statement)).all()
 
-            formatted_messages = []
-            for msg in messages:
-                role = "assistant" if msg.role == MessageRole.assistant else "user"
-                formatted_messages.append({
-                    "role": role,
-                    "content": msg.content
-                })
+            formatted_messages = [
+                {"role": _ROLE_STR[role], "content": content}
+                for role, content in rows
+            ]
 
-            return formatted_messages
+        await set_conversation_history(conversation_id, formatted_messages)
+        return formatted_messages
 
-    def save_message(self, conversation_id: int, role: str, content: str):
+    async def save_message(self, conversation_id: int, role: str, content: str):
         """
         Save a message to the conversation in the database.
 
@@ -350,20 +567,66 @@ class TodoAgentRunner:
             role: The role of the message sender ('user' or 'assistant')
             content: The message content
         """
-        with Session(engine) as session:
-            message_role = MessageRole.assistant if role == "assistant" else MessageRole.user
-            message = Message(
-                conversation_id=conversation_id,
-                role=message_role,
-                content=content
-            )
-            session.add(message)
-            session.commit()
+        await self.save_messages(conversation_id, [(role, content)])
+
+    async def save_messages(self, conversation_id: int, messages: List[Tuple[str, str]]) -> List[int]:
+        """
+        Save several messages to the conversation in a single transaction.
+
+        Uses one multi-row INSERT ... RETURNING id through SQLAlchemy Core,
+        so no ORM objects are built; created_at is filled in by the database.
+
+        Args:
+            conversation_id: The ID of the conversation
+            messages: List of (role, content) pairs, in order
+
+        Returns:
+            The IDs of the inserted messages
+        """
+        rows = [
+            {
+                "conversation_id": conversation_id,
+                "role": MessageRole.assistant if role == "assistant" else MessageRole.user,
+                "content": content
+            }
+            for role, content in messages
+        ]
+
+        async with _session() as session:
+            result = await session.execute(insert(Message).returning(Message.id), rows)
+            message_ids = list(result.scalars())
+            await session.commit()
+
+        await append_conversation_messages(conversation_id, [
+            {"role": row["role"].value, "content": row["content"]}
+            for row in rows
+        ])
+        return message_ids
 
     async def run(self, user_input: str, conversation_id: int) -> Dict[str, Any]:
         """
         Run the agent with user input.
 
+        Turns on the same conversation are serialized (in-process with an
+        asyncio lock, across processes with a Redis lock), so a rapid
+        follow-up reuses the history cached by the turn before it instead
+        of racing it.
+
+        Args:
+            user_input: The user's message
+            conversation_id: The ID of the conversation
+
+        Returns:
+            Dict containing response and conversation_id
+        """
+        async with _conversation_lock(conversation_id):
+            async with hold_conversation_lock(conversation_id):
+                return await self._run_turn(user_input, conversation_id)
+
+    async def _run_turn(self, user_input: str, conversation_id: int) -> Dict[str, Any]:
+        """
+        Load history, run the agent and persist the exchange.
+
         Args:
             user_input: The user's message
             conversation_id: The ID of the conversation
@@ -373,7 +636,7 @@ class TodoAgentRunner:
         """
         try:
             # Load conversation history
-            history = self.load_conversation_history(conversation_id)
+            history = await self.load_conversation_history(conversation_id)
 
             # Prepare input with user context
             context_input = f"[User ID: {self.user_id}]\n{user_input}"
@@ -388,9 +651,11 @@ class TodoAgentRunner:
             # Extract the response
             response_text = result.final_output if hasattr(result, 'final_output') else str(result)
 
-            # Save messages to database
-            self.save_message(conversation_id, "user", user_input)
-            self.save_message(conversation_id, "assistant", response_text)
+            # Save both messages to database in one commit
+            await self.save_messages(conversation_id, [
+                ("user", user_input),
+                ("assistant", response_text)
+            ])
 
             return {
                 "response": response_text,
@@ -399,7 +664,7 @@ class TodoAgentRunner:
 
         except Exception as e:
             error_msg = f"I encountered an issue processing your request. Please try again."
-            self.save_message(conversation_id, "assistant", error_msg)
+            await self.save_message(conversation_id, "assistant", error_msg)
             return {
                 "response": error_msg,
                 "conversation_id": conversation_id,
@@ -411,6 +676,11 @@ class TodoAgentRunner:
         """
         Synchronous wrapper for running the agent.
 
+        The coroutine is scheduled on the shared background event loop, so
+        no loop is created per call and this works even when the calling
+        thread already has a running loop. That loop uses its own database
+        engine and Redis client, never the app's pools.
+
         Args:
             user_input: The user's message
             conversation_id: The ID of the conversation
@@ -418,7 +688,11 @@ class TodoAgentRunner:
         Returns:
             Dict containing response and conversation_id
         """
-        return asyncio.run(self.run(user_input, conversation_id))
+        future = asyncio.run_coroutine_threadsafe(
+            self.run(user_input, conversation_id),
+            _get_background_loop()
+        )
+        return future.result()
 
 
 # =============================================================================
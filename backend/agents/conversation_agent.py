@@ -6,16 +6,29 @@ This agent uses OpenAI's function calling to determine when to execute
 task management operations.
 """
 
-from openai import OpenAI
-from typing import Dict, List, Any
-import json
-from backend.database.deps import get_db_session
+import asyncio
+import httpx
+import numpy as np
+from openai import AsyncOpenAI
+from collections import deque
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+import orjson
+from sqlalchemy import bindparam, insert, select, update
+from backend.database.connection import AsyncSessionLocal
+from backend.agents.llm_cache import EMBEDDING_MODEL, llm_cache, semantic_cache, semantic_query_text
 from backend.models.todo_models import Conversation, Message, MessageRole
 from backend.app.skills.todo_skill import TodoManagementSkill
-from datetime import datetime
-from sqlmodel import Session, select
 
 
+# System prompt (specs/features/ai_agent.md). Kept constant - anything
+# per-request belongs in the user message so the cached prefix stays stable.
+SYSTEM_PROMPT = (
+    "You are a helpful Todo Assistant. You act on behalf of the user. "
+    "If the user wants to add, view, or modify tasks, you MUST call the provided tools. "
+    "Do not ask for confirmation unless necessary."
+)
+
 # Tool definitions for the OpenAI function calling API
 TODO_TOOLS = [
     {
@@ -33,6 +46,31 @@ TODO_TOOLS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "add_tasks",
+            "description": "Add several tasks to the todo list at once",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "tasks": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "title": {"type": "string", "description": "The title of the task"},
+                                "description": {"type": "string", "description": "Optional description of the task"}
+                            },
+                            "required": ["title"]
+                        },
+                        "description": "The tasks to create"
+                    }
+                },
+                "required": ["tasks"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -102,6 +140,65 @@ TODO_TOOLS = [
     }
 ]
 
+# TODO_TOOLS encoded once at import; it is part of every request, so the
+# response cache key hashes these bytes instead of re-encoding the schema
+TODO_TOOLS_JSON = orjson.dumps(TODO_TOOLS)
+
+
+# Context window management: the model sees the running summary plus the
+# unsummarized tail of the conversation. Once the tail reaches
+# MAX_RECENT_TURNS + SUMMARY_BATCH messages, everything but the last
+# MAX_RECENT_TURNS is folded into the summary, so prompt size stays bounded
+MAX_RECENT_TURNS = 8
+SUMMARY_BATCH = 8
+SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_PROMPT = (
+    "Summarize the conversation between a user and their Todo Assistant. "
+    "Keep facts the assistant may need later (task titles, ids, preferences). "
+    "Reply with the summary only."
+)
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    """
+    One OpenAI client for every agent instance: agents are created per
+    request, and a shared HTTP/2 connection pool keeps the TLS session to the
+    API alive between them. Built on first use, so importing the agent
+    doesn't require OPENAI_API_KEY.
+    """
+    return AsyncOpenAI(
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    )
+
+
+# Built once: the unsummarized history of a conversation. Only the two
+# columns are selected and read as mappings, so no Message objects are built
+# on the read path; rows are streamed in batches. Built with the ORM rather
+# than as text so each dialect renders the bare OFFSET (SQLite needs LIMIT -1)
+_HISTORY_STMT = (
+    select(Message.role, Message.content)
+    .where(Message.conversation_id == bindparam("cid"))
+    .order_by(Message.created_at, Message.id)
+    .offset(bindparam("skip"))
+    .execution_options(yield_per=200)
+)
+
+# Built once and run executemany-style with a list of rows; created_at is
+# filled in by the database
+_INSERT_MSG = insert(Message)
+
+# Message role -> role string sent to the model (only assistant is kept apart)
+_ROLE_STR = {
+    role: "assistant" if role == MessageRole.assistant else "user"
+    for role in MessageRole
+}
+
+# Inverse lookup for the role strings callers pass to save_messages
+_STR_TO_ROLE = {"assistant": MessageRole.assistant, "user": MessageRole.user}
+
 
 class ConversationAgent:
     """
@@ -112,6 +209,17 @@ class ConversationAgent:
     TodoManagementSkill.
     """
 
+    # Tool name -> (skill method, argument names it accepts). Arguments the
+    # model omits fall back to the skill method's defaults
+    DISPATCH = {
+        "add_task": ("add_task", ("title", "description")),
+        "add_tasks": ("add_tasks", ("tasks",)),
+        "list_tasks": ("list_tasks", ("status",)),
+        "complete_task": ("complete_task", ("task_id",)),
+        "delete_task": ("delete_task", ("task_id",)),
+        "update_task": ("update_task", ("task_id", "title", "description", "status")),
+    }
+
     def __init__(self, user_id: int = 1):
         """
         Initialize the ConversationAgent.
@@ -119,11 +227,29 @@ class ConversationAgent:
         Args:
             user_id: The ID of the user this agent is serving
         """
-        self.client = OpenAI()
-        self.model = "gpt-4-turbo"
+        # None until first use, then the shared client; tests may assign one
+        self._client: Optional[AsyncOpenAI] = None
+        # Tool routing is a small structured task; the larger model is only
+        # used to phrase the answer once tools have run
+        self.router_model = "gpt-4o-mini"
+        self.answer_model = "gpt-4o"
         self.user_id = user_id
-
-    def run_agent(self, user_input: str, conversation_id: int) -> Dict[str, Any]:
+        # conversation_id -> unsummarized history, kept in step with save_messages
+        self._history_cache: Dict[int, Deque[Dict[str, str]]] = {}
+        # conversation_id -> running summary of the older messages
+        self._summary_cache: Dict[int, Optional[str]] = {}
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            self._client = get_openai_client()
+        return self._client
+
+    @client.setter
+    def client(self, client: AsyncOpenAI) -> None:
+        self._client = client
+
+    async def run_agent(self, user_input: str, conversation_id: int) -> Dict[str, Any]:
         """
         Run the agent with the user input and return the response.
 
@@ -134,8 +260,57 @@ class ConversationAgent:
         Returns:
             Dict containing response and conversation_id
         """
+        try:
+            chunks = [chunk async for chunk in self._run_turn(user_input, conversation_id)]
+            return {
+                "response": "".join(chunks),
+                "conversation_id": conversation_id
+            }
+
+        except Exception as e:
+            error_msg = f"Error running agent: {str(e)}"
+            await self.save_turn(conversation_id, user_input, error_msg)
+            return {
+                "response": error_msg,
+                "conversation_id": conversation_id,
+                "error": True
+            }
+
+    async def run_agent_stream(self, user_input: str, conversation_id: int) -> AsyncIterator[str]:
+        """
+        Run the agent and yield the response text as it is generated.
+
+        Intended for SSE/WebSocket endpoints; on failure the error message
+        is yielded as the last chunk.
+
+        Args:
+            user_input: The user's message
+            conversation_id: The ID of the conversation
+
+        Yields:
+            Chunks of the assistant's reply
+        """
+        try:
+            async for chunk in self._run_turn(user_input, conversation_id):
+                yield chunk
+
+        except Exception as e:
+            error_msg = f"Error running agent: {str(e)}"
+            await self.save_turn(conversation_id, user_input, error_msg)
+            yield error_msg
+
+    async def _run_turn(self, user_input: str, conversation_id: int) -> AsyncIterator[str]:
+        """
+        Run one agent turn, yielding the reply as it arrives, and save the
+        turn once the reply is complete. Errors propagate to the caller.
+        """
         # Load conversation history
-        messages = self.load_conversation_history(conversation_id)
+        # Static system prompt first, then history in (created_at, id) order,
+        # then the new user turn: the prefix stays byte-identical across turns
+        # so the provider's prompt cache can reuse it
+        history = await self.load_conversation_history(conversation_id)
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        messages.extend(history)
 
         # Add user message to the conversation
         messages.append({
@@ -143,63 +318,127 @@ class ConversationAgent:
             "content": user_input
         })
 
+        # An identical request already answered without tools can be
+        # replayed; temperature=0 keeps replies deterministic enough to reuse
+        cache_key = llm_cache.make_key(self.router_model, TODO_TOOLS_JSON, messages)
+        cached_response = await llm_cache.get(cache_key)
+        if cached_response is not None:
+            await self.save_turn(conversation_id, user_input, cached_response)
+            yield cached_response
+            return
+
         # Call the OpenAI API with tools
+        router_call = asyncio.create_task(self.client.chat.completions.create(
+            model=self.router_model,
+            messages=messages,
+            tools=TODO_TOOLS,
+            tool_choice="auto",
+            temperature=0
+        ))
+
+        # Meanwhile look for a paraphrase of an earlier tool-free question in
+        # this conversation. The embedding runs alongside the router call, so
+        # a miss adds no round trip, and a hit cancels the router call
+        query_text = semantic_query_text(user_input, history)
+        embedding = None
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=TODO_TOOLS,
-                tool_choice="auto"
-            )
-
-            response_message = response.choices[0].message
-            tool_calls = response_message.tool_calls
-
-            if tool_calls:
-                # If the model wants to call tools, execute them
-                tool_results = []
-                for tool_call in tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-
-                    # Execute the tool using TodoManagementSkill
-                    result = self.execute_tool(function_name, function_args)
-                    tool_results.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "content": json.dumps(result)
-                    })
-
-                # Get the final response after tool execution
-                second_response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages + [response_message] + tool_results,
-                )
-
-                final_response = second_response.choices[0].message.content
-            else:
-                # If no tools were called, return the direct response
-                final_response = response_message.content
+            if query_text is not None:
+                embedding = await self.embed_query(query_text)
+            if embedding is not None:
+                cached_response = semantic_cache.get(conversation_id, embedding)
+            if cached_response is None:
+                response = await router_call
+        finally:
+            if not router_call.done():
+                router_call.cancel()
+
+        if cached_response is not None:
+            await self.save_turn(conversation_id, user_input, cached_response)
+            yield cached_response
+            return
+
+        response_message = response.choices[0].message
+        tool_calls = response_message.tool_calls
+
+        if tool_calls:
+            # Run the whole batch against one session and one skill, so a
+            # turn checks out a single connection however many tools it calls
+            results = await self.execute_tools([
+                (tool_call.function.name, orjson.loads(tool_call.function.arguments))
+                for tool_call in tool_calls
+            ])
+
+            tool_results = [
+                {
+                    "tool_call_id": tool_call.id,
+                    "role": "tool",
+                    "content": orjson.dumps(result).decode()
+                }
+                for tool_call, result in zip(tool_calls, results)
+            ]
+
+            # Resend only what the model needs from its tool-call message:
+            # no null content, refusal or other response-only fields
+            assistant_message = {
+                "role": "assistant",
+                "tool_calls": [
+                    {
+                        "id": tool_call.id,
+                        "type": "function",
+                        "function": {
+                            "name": tool_call.function.name,
+                            "arguments": tool_call.function.arguments
+                        }
+                    }
+                    for tool_call in tool_calls
+                ]
+            }
 
-            # Save the interaction to the conversation
-            self.save_message(conversation_id, "user", user_input)
-            self.save_message(conversation_id, "assistant", final_response)
+            # Stream the final response after tool execution so the first
+            # tokens reach the caller without waiting for the whole reply
+            stream = await self.client.chat.completions.create(
+                model=self.answer_model,
+                messages=messages + [assistant_message] + tool_results,
+                temperature=0,
+                stream=True
+            )
 
-            return {
-                "response": final_response,
-                "conversation_id": conversation_id
-            }
+            parts = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    parts.append(content)
+                    yield content
+            final_response = "".join(parts)
+        else:
+            # If no tools were called, return the direct response. Only
+            # these replies are cached - tool calls have side effects
+            final_response = response_message.content
+            if final_response is not None:
+                await llm_cache.set(cache_key, final_response)
+                if embedding is not None:
+                    semantic_cache.set(conversation_id, embedding, final_response)
+                yield final_response
+
+        # Save the interaction to the conversation
+        await self.save_turn(conversation_id, user_input, final_response)
+
+    async def embed_query(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a query (see semantic_query_text) for the semantic cache.
 
-        except Exception as e:
-            error_msg = f"Error running agent: {str(e)}"
-            self.save_message(conversation_id, "assistant", error_msg)
-            return {
-                "response": error_msg,
-                "conversation_id": conversation_id,
-                "error": True
-            }
+        Returns None if the embedding call fails, so the turn just skips
+        the semantic cache.
+        """
+        try:
+            response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        except Exception:
+            return None
+        return np.asarray(response.data[0].embedding, dtype=np.float32)
 
-    def execute_tool(self, function_name: str, function_args: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_tool(self, function_name: str, function_args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a tool function using the TodoManagementSkill.
 
@@ -210,51 +449,61 @@ class ConversationAgent:
         Returns:
             Dict containing the result of the tool execution
         """
-        with get_db_session() as session:
-            # Create skill instance with session and user context
-            skill = TodoManagementSkill(session=session, user_id=self.user_id)
-
-            try:
-                if function_name == "add_task":
-                    return skill.add_task(
-                        title=function_args.get("title"),
-                        description=function_args.get("description", "")
-                    )
-                elif function_name == "list_tasks":
-                    return skill.list_tasks(
-                        status=function_args.get("status", "all")
-                    )
-                elif function_name == "complete_task":
-                    return skill.complete_task(
-                        task_id=function_args.get("task_id")
-                    )
-                elif function_name == "delete_task":
-                    return skill.delete_task(
-                        task_id=function_args.get("task_id")
-                    )
-                elif function_name == "update_task":
-                    return skill.update_task(
-                        task_id=function_args.get("task_id"),
-                        title=function_args.get("title"),
-                        description=function_args.get("description"),
-                        status=function_args.get("status")
-                    )
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Unknown function: {function_name}",
-                        "message": f"The function '{function_name}' is not supported."
-                    }
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": str(e),
-                    "message": f"Error executing {function_name}: {str(e)}"
-                }
+        results = await self.execute_tools([(function_name, function_args)])
+        return results[0]
+
+    async def execute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Execute a turn's tool calls in order on one session and one skill.
+
+        Args:
+            calls: List of (function_name, function_args) pairs
+
+        Returns:
+            List of result dicts, one per call
+        """
+        async with AsyncSessionLocal() as session:
+            # Create skill instance with session and user context; its
+            # mutations are flushed and committed once for the whole batch
+            skill = TodoManagementSkill(session=session, user_id=self.user_id, autocommit=False)
+            results = []
+            for function_name, function_args in calls:
+                # A savepoint per call, so a failed call rolls back only its
+                # own changes and not the earlier calls' in this batch
+                async with session.begin_nested():
+                    results.append(await self._dispatch_tool(skill, function_name, function_args))
+            await skill.commit()
+            return results
+
+    async def _dispatch_tool(
+        self, skill: TodoManagementSkill, function_name: str, function_args: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Dispatch one tool call to the skill."""
+        try:
+            method_name, keys = self.DISPATCH[function_name]
+        except KeyError:
+            return {
+                "success": False,
+                "error": f"Unknown function: {function_name}",
+                "message": f"The function '{function_name}' is not supported."
+            }
+
+        kwargs = {key: function_args[key] for key in keys if key in function_args}
+        try:
+            return await getattr(skill, method_name)(**kwargs)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Error executing {function_name}: {str(e)}"
+            }
 
-    def load_conversation_history(self, conversation_id: int) -> List[Dict[str, str]]:
+    async def load_conversation_history(self, conversation_id: int) -> List[Dict[str, str]]:
         """
-        Load conversation history from the database.
+        Load the context for a conversation: its running summary (if any)
+        followed by the messages the summary does not cover yet.
+
+        Served from the in-process cache when warm.
 
         Args:
             conversation_id: The ID of the conversation
@@ -262,23 +511,87 @@ class ConversationAgent:
         Returns:
             List of message dicts formatted for OpenAI API
         """
-        with get_db_session() as session:
-            statement = select(Message).where(
-                Message.conversation_id == conversation_id
-            ).order_by(Message.created_at)
-            messages = session.exec(statement).all()
-
-            formatted_messages = []
-            for msg in messages:
-                role = "assistant" if msg.role == MessageRole.assistant else "user"
-                formatted_messages.append({
-                    "role": role,
-                    "content": msg.content
-                })
-
-            return formatted_messages
-
-    def save_message(self, conversation_id: int, role: str, content: str):
+        history = self._history_cache.get(conversation_id)
+        if history is None:
+            async with AsyncSessionLocal() as session:
+                conversation = await session.get(Conversation, conversation_id)
+                summary = conversation.summary if conversation else None
+                summarized_count = conversation.summarized_count if conversation else 0
+
+                result = await session.stream(
+                    _HISTORY_STMT, {"cid": conversation_id, "skip": summarized_count}
+                )
+                history = deque([
+                    {"role": _ROLE_STR[row["role"]], "content": row["content"]}
+                    async for row in result.mappings()
+                ])
+
+            self._history_cache[conversation_id] = history
+            self._summary_cache[conversation_id] = summary
+
+        if len(history) >= MAX_RECENT_TURNS + SUMMARY_BATCH:
+            await self.summarize_history(conversation_id)
+
+        context = []
+        summary = self._summary_cache.get(conversation_id)
+        if summary:
+            context.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {summary}"
+            })
+        context.extend(history)
+        return context
+
+    async def summarize_history(self, conversation_id: int):
+        """
+        Fold all but the last MAX_RECENT_TURNS cached messages into the
+        conversation's running summary and persist it.
+
+        On failure the messages stay in the history and are retried on the
+        next turn.
+
+        Args:
+            conversation_id: The ID of the conversation
+        """
+        history = self._history_cache[conversation_id]
+        folded = list(history)[:-MAX_RECENT_TURNS]
+        if not folded:
+            return
+
+        previous = self._summary_cache.get(conversation_id)
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in folded)
+        if previous:
+            transcript = f"Summary so far: {previous}\n\n{transcript}"
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": transcript}
+                ],
+                temperature=0
+            )
+            summary = response.choices[0].message.content
+
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(Conversation)
+                    .where(Conversation.id == conversation_id)
+                    .values(
+                        summary=summary,
+                        summarized_count=Conversation.summarized_count + len(folded)
+                    )
+                )
+                await session.commit()
+        except Exception:
+            return
+
+        for _ in folded:
+            history.popleft()
+        self._summary_cache[conversation_id] = summary
+
+    async def save_message(self, conversation_id: int, role: str, content: str):
         """
         Save a message to the conversation in the database.
 
@@ -287,12 +600,44 @@ class ConversationAgent:
             role: The role of the message sender ('user' or 'assistant')
             content: The message content
         """
-        with get_db_session() as session:
-            message_role = MessageRole.assistant if role == "assistant" else MessageRole.user
-            message = Message(
-                conversation_id=conversation_id,
-                role=message_role,
-                content=content
+        await self.save_messages(conversation_id, [(role, content)])
+
+    async def save_messages(self, conversation_id: int, messages: List[Tuple[str, str]]):
+        """
+        Save several messages to the conversation in a single transaction.
+
+        Args:
+            conversation_id: The ID of the conversation
+            messages: List of (role, content) pairs, in order; role is 'user' or 'assistant'
+        """
+        async with AsyncSessionLocal() as session:
+            await session.execute(_INSERT_MSG, [
+                {
+                    "conversation_id": conversation_id,
+                    "role": _STR_TO_ROLE[role],
+                    "content": content
+                }
+                for role, content in messages
+            ])
+            await session.commit()
+
+        cached = self._history_cache.get(conversation_id)
+        if cached is not None:
+            cached.extend(
+                {"role": role, "content": content}
+                for role, content in messages
             )
-            session.add(message)
-            session.commit()
+
+    async def save_turn(self, conversation_id: int, user_input: str, assistant_response: str):
+        """
+        Save a user message and the assistant's reply in one transaction.
+
+        Args:
+            conversation_id: The ID of the conversation
+            user_input: The user's message
+            assistant_response: The assistant's reply (or error message)
+        """
+        await self.save_messages(conversation_id, [
+            ("user", user_input),
+            ("assistant", assistant_response)
+        ])
@@ -0,0 +1,150 @@
+"""
+LLM Response Cache
+
+Caches final assistant replies keyed by a hash of the exact request
+(model, tools, messages). Only worth doing for deterministic calls, so the
+agents send temperature=0. Replies that requested tool calls are never
+cached: the tools have side effects and must run every time.
+
+SemanticCache is a second tier for paraphrases ("list my tasks" vs "show
+my todos"): replies are matched by cosine similarity of the embedding of
+the user input plus the last few messages before it (semantic_query_text),
+within the same conversation.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+import redis
+from cachetools import TTLCache
+
+# How long a cached reply is served before the model is asked again
+LLM_CACHE_TTL = 3600
+# Embedding model and minimum cosine similarity for a semantic cache hit
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+# Inputs shorter than this ("ok", "yes", "thanks") carry too little meaning
+# of their own to match on, so they skip the semantic cache
+SEMANTIC_MIN_CHARS = 12
+# How much of the preceding conversation is embedded with the input
+SEMANTIC_CONTEXT_MESSAGES = 2
+SEMANTIC_CONTEXT_CHARS = 200
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def semantic_query_text(user_input: str, history: List[Dict[str, str]]) -> Optional[str]:
+    """
+    The text embedded for a semantic cache lookup, or None to skip it.
+
+    The input is embedded together with a normalized tail of the history, so
+    the same words after a different exchange ("and the next one?") don't
+    match each other's replies.
+    """
+    query = _normalize(user_input)
+    if len(query) < SEMANTIC_MIN_CHARS:
+        return None
+    tail = [
+        f"{message['role']}: {_normalize(message['content'])[:SEMANTIC_CONTEXT_CHARS]}"
+        for message in history if message["role"] != "system"
+    ][-SEMANTIC_CONTEXT_MESSAGES:]
+    return "\n".join(tail + [f"user: {query}"])
+
+
+class LLMCache:
+    """
+    Reply cache backed by an in-process TTL dict, or by Redis when a
+    redis.asyncio client is passed in.
+    """
+
+    def __init__(self, backend: Optional[Any] = None, ttl: int = LLM_CACHE_TTL, maxsize: int = 1024):
+        self.backend = backend
+        self.ttl = ttl
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def make_key(model: str, tools_json: bytes, messages: List[Dict[str, Any]]) -> str:
+        """
+        Hash the request into a stable cache key.
+
+        tools_json is the tool schema already encoded with orjson, so the
+        (static) schema is not re-serialized on every lookup.
+        """
+        digest = hashlib.sha256(model.encode())
+        digest.update(tools_json)
+        digest.update(orjson.dumps(messages, option=orjson.OPT_SORT_KEYS))
+        return "llm:v1:" + digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached reply, or None on a miss."""
+        if self.backend is None:
+            return self._local.get(key)
+        try:
+            return await self.backend.get(key)
+        except redis.RedisError:
+            return None
+
+    async def set(self, key: str, response: str) -> None:
+        """Store a reply under key."""
+        if self.backend is None:
+            self._local[key] = response
+            return
+        try:
+            await self.backend.setex(key, self.ttl, response)
+        except redis.RedisError:
+            pass
+
+
+class SemanticCache:
+    """
+    Per-conversation cache of tool-free replies, looked up by embedding
+    similarity.
+
+    Each conversation keeps its query embeddings as one float32 matrix so a
+    lookup is a single matrix-vector product. Conversations are evicted
+    least-recently-set first, or once idle for ttl seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl: int = LLM_CACHE_TTL,
+        maxsize: int = 1024,
+        per_conversation: int = 32
+    ):
+        self.threshold = threshold
+        self.per_conversation = per_conversation
+        # conversation_id -> (embeddings matrix, replies)
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, conversation_id: int, embedding: np.ndarray) -> Optional[str]:
+        """Return the reply cached for the closest earlier query, or None."""
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        matrix, responses = entry
+        # OpenAI embeddings are unit length, so the dot product is the cosine
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return responses[best]
+
+    def set(self, conversation_id: int, embedding: np.ndarray, response: str) -> None:
+        """Cache a reply for a query embedding, keeping the newest entries."""
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            matrix, responses = embedding[np.newaxis, :], [response]
+        else:
+            matrix = np.vstack((entry[0], embedding))[-self.per_conversation:]
+            responses = (entry[1] + [response])[-self.per_conversation:]
+        self._entries[conversation_id] = (matrix, responses)
+
+
+# Shared across agent instances, which are created per request
+llm_cache = LLMCache()
+semantic_cache = SemanticCache()
@@ -0,0 +1,59 @@
+"""conversation summary, server-side timestamps and listing indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 23:09:41.112208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_LIST_COLUMNS = ['id', 'title', 'description', 'created_at', 'updated_at']
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('summary', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        # Existing conversations start with nothing summarized
+        batch_op.add_column(sa.Column('summarized_count', sa.Integer(), nullable=False, server_default='0'))
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), existing_nullable=False,
+                              server_default=sa.func.now())
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), existing_nullable=False,
+                              server_default=sa.func.now())
+        batch_op.create_index('ix_task_user_status', ['user_id', 'status'], unique=False,
+                              postgresql_include=TASK_LIST_COLUMNS)
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), existing_nullable=False,
+                              server_default=sa.func.now())
+        batch_op.create_index('ix_msg_conv_created', ['conversation_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_msg_conv_created')
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), existing_nullable=False,
+                              server_default=None)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_status', postgresql_include=TASK_LIST_COLUMNS)
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), existing_nullable=False,
+                              server_default=None)
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), existing_nullable=False,
+                              server_default=None)
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('summarized_count')
+        batch_op.drop_column('summary')
@@ -7,11 +7,17 @@ making it portable to any agent.
 """
 
 from typing import Optional, List, Dict, Any
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, delete, func, insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
 
 from backend.models.todo_models import Task, TaskStatus
 
+# Status string -> TaskStatus, checked with a dict lookup rather than the
+# enum constructor and a ValueError
+_STATUS_MAP = {s.value: s for s in TaskStatus}
+_VALID_STATUSES = frozenset(_STATUS_MAP) | {"all"}
 
 class TodoManagementSkill:
     """
@@ -19,28 +25,85 @@ class TodoManagementSkill:
 
     This class provides methods for:
     - add_task: Creates a new task with title and optional description
+    - add_tasks: Creates several tasks in one statement
     - list_tasks: Retrieves tasks, supporting filtering by status
     - update_task: Modifies existing tasks
     - complete_task: Marks a task as done
     - delete_task: Removes a task
     """
 
-    def __init__(self, session: Session, user_id: int):
+    # Listing statements, built once; only the listed columns, so rows come
+    # back as tuples rather than ORM objects. yield_per streams them in
+    # batches through session.stream (a server-side cursor on PostgreSQL)
+    # instead of buffering all
+    _LIST_ALL_STMT = (
+        select(
+            Task.id, Task.title, Task.description, Task.status, Task.created_at, Task.updated_at
+        )
+        .where(Task.user_id == bindparam("uid"))
+        .execution_options(yield_per=500)
+    )
+    _LIST_STATUS_STMT = _LIST_ALL_STMT.where(Task.status == bindparam("st"))
+
+    # Delete with the ownership check folded into the WHERE clause
+    _DELETE_STMT = (
+        delete(Task)
+        .where(Task.id == bindparam("tid"), Task.user_id == bindparam("uid"))
+        .returning(Task.title)
+    )
+
+    def __init__(self, session: AsyncSession, user_id: int, autocommit: bool = True):
         """
         Initialize the TodoManagementSkill with a database session and user context.
 
         Args:
-            session: SQLModel database session
+            session: Async SQLModel database session; every method is a
+                coroutine, so DB round-trips don't block the event loop
             user_id: The ID of the user performing operations (for safety verification)
+            autocommit: Commit after every mutation. When False, mutations are
+                only flushed and the caller commits once with commit(); a
+                failed mutation then rolls back to the caller's savepoint
+                (session.begin_nested()), or everything since the last commit
         """
         self._session = session
         self._user_id = user_id
+        self._autocommit = autocommit
+        # status -> list_tasks result, for this skill's session only. Kept
+        # per instance (one turn or tool call) rather than per process: other
+        # workers, the REST API and the MCP server write without telling this
+        # process, and in batch mode a listing can include flushed rows no
+        # other session sees yet. Any mutation or rollback clears it
+        self._list_cache: Dict[str, List[Dict[str, Any]]] = {}
 
     @property
     def user_id(self) -> int:
         """Get the current user ID."""
         return self._user_id
 
+    async def commit(self) -> None:
+        """Commit the mutations flushed since the last commit."""
+        await self._session.commit()
+
+    async def _commit(self) -> None:
+        """Finish a mutation: commit it, or just flush it in batch mode."""
+        if self._autocommit:
+            await self._session.commit()
+        else:
+            await self._session.flush()
+        self._list_cache.clear()
+
+    async def _rollback(self) -> None:
+        """
+        Undo a failed mutation: just the savepoint the caller opened around
+        it, if any, otherwise everything since the last commit.
+        """
+        self._list_cache.clear()
+        savepoint = self._session.get_nested_transaction()
+        if savepoint is not None:
+            await savepoint.rollback()
+        else:
+            await self._session.rollback()
+
     def _verify_task_ownership(self, task: Optional[Task]) -> bool:
         """
         Verify that a task belongs to the current user.
@@ -55,7 +118,7 @@ class TodoManagementSkill:
             return False
         return task.user_id == self._user_id
 
-    def _get_task_by_id(self, task_id: int) -> Optional[Task]:
+    async def _get_task_by_id(self, task_id: int) -> Optional[Task]:
         """
         Retrieve a task by ID, ensuring it belongs to the current user.
 
@@ -65,12 +128,12 @@ class TodoManagementSkill:
         Returns:
             The task if found and owned by user, None otherwise
         """
-        task = self._session.get(Task, task_id)
+        task = await self._session.get(Task, task_id)
         if task and self._verify_task_ownership(task):
             return task
         return None
 
-    def add_task(self, title: str, description: str = "") -> Dict[str, Any]:
+    async def add_task(self, title: str, description: str = "") -> Dict[str, Any]:
         """
         Add a new task to the todo list.
 
@@ -82,15 +145,15 @@ class TodoManagementSkill:
             A structured JSON response confirming the action
         """
         try:
-            task = Task(
+            # One round-trip: the generated id comes back with the INSERT
+            stmt = insert(Task).values(
                 title=title,
                 description=description,
                 user_id=self._user_id,
                 status=TaskStatus.pending
-            )
-            self._session.add(task)
-            self._session.commit()
-            self._session.refresh(task)
+            ).returning(Task.id, Task.title, Task.description, Task.status)
+            task = (await self._session.execute(stmt)).one()
+            await self._commit()
 
             return {
                 "success": True,
@@ -102,7 +165,7 @@ class TodoManagementSkill:
                 "message": f"Task '{task.title}' has been created successfully."
             }
         except Exception as e:
-            self._session.rollback()
+            await self._rollback()
             return {
                 "success": False,
                 "action": "add_task",
@@ -110,7 +173,58 @@ class TodoManagementSkill:
                 "message": f"Failed to create task: {str(e)}"
             }
 
-    def list_tasks(self, status: str = "all") -> Dict[str, Any]:
+    async def add_tasks(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add several tasks to the todo list in a single INSERT.
+
+        Args:
+            tasks: List of {"title": ..., "description": ...} dicts
+
+        Returns:
+            A structured JSON response listing the created tasks
+        """
+        if not tasks:
+            return {
+                "success": False,
+                "action": "add_tasks",
+                "error": "No tasks given",
+                "message": "Please provide at least one task to create."
+            }
+
+        try:
+            result = await self._session.execute(
+                insert(Task).returning(Task.id, Task.title),
+                [
+                    {
+                        "title": task["title"],
+                        "description": task.get("description", ""),
+                        "user_id": self._user_id,
+                        "status": TaskStatus.pending
+                    }
+                    for task in tasks
+                ]
+            )
+            rows = result.all()
+            await self._commit()
+
+            created = [{"task_id": task_id, "title": title} for task_id, title in rows]
+            return {
+                "success": True,
+                "action": "add_tasks",
+                "tasks": created,
+                "total": len(created),
+                "message": f"{len(created)} task(s) have been created successfully."
+            }
+        except Exception as e:
+            await self._rollback()
+            return {
+                "success": False,
+                "action": "add_tasks",
+                "error": str(e),
+                "message": f"Failed to create tasks: {str(e)}"
+            }
+
+    async def list_tasks(self, status: str = "all") -> Dict[str, Any]:
         """
         List all tasks or filter by status.
 
@@ -121,33 +235,35 @@ class TodoManagementSkill:
             A structured JSON response with the list of tasks
         """
         try:
-            query = select(Task).where(Task.user_id == self._user_id)
-
-            status_filter = None
-            if status != "all":
-                try:
-                    status_filter = TaskStatus(status)
-                    query = query.where(Task.status == status_filter)
-                except ValueError:
-                    return {
-                        "success": False,
-                        "action": "list_tasks",
-                        "error": f"Invalid status: {status}. Use 'all', 'pending', or 'completed'",
-                        "message": f"Invalid status filter '{status}'. Please use 'all', 'pending', or 'completed'."
-                    }
-
-            tasks = self._session.exec(query).all()
+            if status not in _VALID_STATUSES:
+                return {
+                    "success": False,
+                    "action": "list_tasks",
+                    "error": f"Invalid status: {status}. Use 'all', 'pending', or 'completed'",
+                    "message": f"Invalid status filter '{status}'. Please use 'all', 'pending', or 'completed'."
+                }
 
-            task_list = []
-            for task in tasks:
-                task_list.append({
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status.value,
-                    "created_at": task.created_at.isoformat() if task.created_at else None,
-                    "updated_at": task.updated_at.isoformat() if task.updated_at else None
-                })
+            task_list = self._list_cache.get(status)
+            if task_list is None:
+                if status == "all":
+                    rows = await self._session.stream(self._LIST_ALL_STMT, {"uid": self._user_id})
+                else:
+                    rows = await self._session.stream(
+                        self._LIST_STATUS_STMT, {"uid": self._user_id, "st": _STATUS_MAP[status]}
+                    )
+                iso = datetime.isoformat
+                task_list = [
+                    {
+                        "id": task_id,
+                        "title": title,
+                        "description": description,
+                        "status": task_status.value,
+                        "created_at": iso(created_at) if created_at else None,
+                        "updated_at": iso(updated_at) if updated_at else None
+                    }
+                    async for task_id, title, description, task_status, created_at, updated_at in rows
+                ]
+                self._list_cache[status] = task_list
 
             filter_desc = f" with status '{status}'" if status != "all" else ""
             return {
@@ -166,7 +282,7 @@ class TodoManagementSkill:
                 "message": f"Failed to retrieve tasks: {str(e)}"
             }
 
-    def update_task(
+    async def update_task(
         self,
         task_id: int,
         title: Optional[str] = None,
@@ -186,31 +302,19 @@ class TodoManagementSkill:
             A structured JSON response confirming the action
         """
         try:
-            task = self._get_task_by_id(task_id)
-
-            if not task:
-                return {
-                    "success": False,
-                    "action": "update_task",
-                    "task_id": task_id,
-                    "error": f"Task with ID {task_id} not found",
-                    "message": f"Could not find task with ID {task_id}. Please check the ID and try again."
-                }
-
             # Track what was updated
             updates = []
+            values = {}
 
             if title is not None:
-                task.title = title
+                values["title"] = title
                 updates.append("title")
             if description is not None:
-                task.description = description
+                values["description"] = description
                 updates.append("description")
             if status is not None:
-                try:
-                    task.status = TaskStatus(status)
-                    updates.append("status")
-                except ValueError:
+                status_enum = _STATUS_MAP.get(status)
+                if status_enum is None:
                     return {
                         "success": False,
                         "action": "update_task",
@@ -218,11 +322,29 @@ class TodoManagementSkill:
                         "error": f"Invalid status: {status}",
                         "message": f"Invalid status '{status}'. Please use 'pending' or 'completed'."
                     }
+                values["status"] = status_enum
+                updates.append("status")
+
+            # Ownership is part of the WHERE clause, so a missing or foreign
+            # task simply matches no row
+            stmt = (
+                update(Task)
+                .where(Task.id == task_id, Task.user_id == self._user_id)
+                .values(**values, updated_at=func.now())
+                .returning(Task.id, Task.title, Task.description, Task.status)
+            )
+            task = (await self._session.execute(stmt)).first()
 
-            task.updated_at = datetime.utcnow()
-            self._session.add(task)
-            self._session.commit()
-            self._session.refresh(task)
+            if not task:
+                return {
+                    "success": False,
+                    "action": "update_task",
+                    "task_id": task_id,
+                    "error": f"Task with ID {task_id} not found",
+                    "message": f"Could not find task with ID {task_id}. Please check the ID and try again."
+                }
+
+            await self._commit()
 
             return {
                 "success": True,
@@ -235,7 +357,7 @@ class TodoManagementSkill:
                 "message": f"Task '{task.title}' has been updated. Changed: {', '.join(updates)}."
             }
         except Exception as e:
-            self._session.rollback()
+            await self._rollback()
             return {
                 "success": False,
                 "action": "update_task",
@@ -244,7 +366,7 @@ class TodoManagementSkill:
                 "message": f"Failed to update task: {str(e)}"
             }
 
-    def complete_task(self, task_id: int) -> Dict[str, Any]:
+    async def complete_task(self, task_id: int) -> Dict[str, Any]:
         """
         Mark a task as completed.
 
@@ -255,19 +377,32 @@ class TodoManagementSkill:
             A structured JSON response confirming the action
         """
         try:
-            task = self._get_task_by_id(task_id)
+            stmt = (
+                update(Task)
+                .where(
+                    Task.id == task_id,
+                    Task.user_id == self._user_id,
+                    Task.status != TaskStatus.completed
+                )
+                .values(status=TaskStatus.completed, updated_at=func.now())
+                .returning(Task.id, Task.title, Task.status)
+            )
+            task = (await self._session.execute(stmt)).first()
 
             if not task:
-                return {
-                    "success": False,
-                    "action": "complete_task",
-                    "task_id": task_id,
-                    "error": f"Task with ID {task_id} not found",
-                    "message": f"Could not find task with ID {task_id}. Please check the ID and try again."
-                }
+                # Nothing updated: either the task is already completed or it
+                # doesn't exist for this user. Only this path needs a SELECT
+                task = await self._get_task_by_id(task_id)
+
+                if not task:
+                    return {
+                        "success": False,
+                        "action": "complete_task",
+                        "task_id": task_id,
+                        "error": f"Task with ID {task_id} not found",
+                        "message": f"Could not find task with ID {task_id}. Please check the ID and try again."
+                    }
 
-            # Check if already completed
-            if task.status == TaskStatus.completed:
                 return {
                     "success": True,
                     "action": "complete_task",
@@ -277,11 +412,7 @@ class TodoManagementSkill:
                     "message": f"Task '{task.title}' was already marked as completed."
                 }
 
-            task.status = TaskStatus.completed
-            task.updated_at = datetime.utcnow()
-            self._session.add(task)
-            self._session.commit()
-            self._session.refresh(task)
+            await self._commit()
 
             return {
                 "success": True,
@@ -292,7 +423,7 @@ class TodoManagementSkill:
                 "message": f"Task '{task.title}' has been marked as completed."
             }
         except Exception as e:
-            self._session.rollback()
+            await self._rollback()
             return {
                 "success": False,
                 "action": "complete_task",
@@ -301,7 +432,7 @@ class TodoManagementSkill:
                 "message": f"Failed to complete task: {str(e)}"
             }
 
-    def delete_task(self, task_id: int) -> Dict[str, Any]:
+    async def delete_task(self, task_id: int) -> Dict[str, Any]:
         """
         Delete a task from the todo list.
 
@@ -312,9 +443,12 @@ class TodoManagementSkill:
             A structured JSON response confirming the action
         """
         try:
-            task = self._get_task_by_id(task_id)
+            result = await self._session.execute(
+                self._DELETE_STMT, {"tid": task_id, "uid": self._user_id}
+            )
+            task_title = result.scalar_one_or_none()
 
-            if not task:
+            if task_title is None:
                 return {
                     "success": False,
                     "action": "delete_task",
@@ -323,9 +457,7 @@ class TodoManagementSkill:
                     "message": f"Could not find task with ID {task_id}. Please check the ID and try again."
                 }
 
-            task_title = task.title
-            self._session.delete(task)
-            self._session.commit()
+            await self._commit()
 
             return {
                 "success": True,
@@ -335,7 +467,7 @@ class TodoManagementSkill:
                 "message": f"Task '{task_title}' has been deleted successfully."
             }
         except Exception as e:
-            self._session.rollback()
+            await self._rollback()
             return {
                 "success": False,
                 "action": "delete_task",
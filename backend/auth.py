@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict
 import os
+import threading
+import time
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -13,11 +15,37 @@ ALGORITHM = "HS256"
 
 security = HTTPBearer()
 
+# Decoded payloads of recently seen tokens, so an interactive session
+# verifies its token's signature about once per TTL. Bounded so unique
+# tokens can't grow it; a token's own exp claim still wins over the TTL
+TOKEN_CACHE_TTL = 20 * 60
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+# verify_token is a sync dependency, so FastAPI runs it on its thread pool;
+# TTLCache is not thread-safe. Also guards the stats counters
+_TOKEN_CACHE_LOCK = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0}
+
+
+def token_cache_stats() -> Dict[str, int]:
+    """Hit/miss counts for the token cache in this process."""
+    with _TOKEN_CACHE_LOCK:
+        return {**_token_cache_stats, "size": len(_token_cache)}
+
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Verify JWT token from Better Auth."""
     token = credentials.credentials
 
+    with _TOKEN_CACHE_LOCK:
+        payload = _token_cache.get(token)
+        if payload is not None and "exp" in payload and payload["exp"] <= time.time():
+            # Expired since it was cached; let jwt.decode reject it
+            _token_cache.pop(token, None)
+            payload = None
+        _token_cache_stats["hits" if payload is not None else "misses"] += 1
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
@@ -29,6 +57,8 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        with _TOKEN_CACHE_LOCK:
+            _token_cache[token] = payload
         return payload
 
     except JWTError:
@@ -0,0 +1,310 @@
+"""
+Redis Cache
+
+Cache-aside helpers for the read-heavy agent paths. Task listings are
+cached per (user_id, status) under the user's current task-list version,
+which every mutation increments. Conversation histories are cached as Redis lists and appended
+to as new messages are saved.
+
+Redis is treated as an optimization only: if it is unreachable every
+lookup is a miss and every write is skipped, so callers fall back to the
+database.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+import weakref
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Optional, List, Dict, Any
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# How long a cached task listing lives before it is re-read from the DB
+TASK_LIST_TTL = 300
+# Short-lived lock taken while one caller refills a missing key
+FILL_LOCK_TTL = 5
+# Conversation histories are kept for a day after their last write
+CONVERSATION_TTL = 86400
+# A conversation lock expires this long after its holder stops refreshing
+# it (e.g. the worker died); a running turn extends it every third of that
+CONVERSATION_LOCK_TTL = 30
+
+# Delete a lock only if it still holds our token, so an expired lock that
+# another worker has since taken is left alone
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Push a lock's expiry back only if it still holds our token
+_EXTEND_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+TASK_STATUSES = ("all", "pending", "completed")
+
+pool = aioredis.ConnectionPool.from_url(REDIS_URL, decode_responses=True)
+r = aioredis.Redis(connection_pool=pool)
+
+# redis.asyncio connections belong to the event loop that opened them, so
+# r serves the app's loop and any other long-lived loop (agent.run_sync's
+# background loop) registers a client of its own with open_loop_client
+_LOOP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+
+
+def open_loop_client(loop: asyncio.AbstractEventLoop) -> aioredis.Redis:
+    """Create the Redis client used by cache calls made on loop."""
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    _LOOP_CLIENTS[loop] = client
+    return client
+
+
+def _redis() -> aioredis.Redis:
+    """Return the Redis client for the running event loop."""
+    return _LOOP_CLIENTS.get(asyncio.get_running_loop(), r)
+
+
+def task_list_version_key(user_id: int) -> str:
+    """Build the key holding a user's task-list version."""
+    return f"todo:v1:user:{user_id}:tasks:version"
+
+
+def task_list_key(user_id: int, status: str, version: int) -> str:
+    """Build the cache key for a user's task listing at a given version."""
+    return f"todo:v1:user:{user_id}:tasks:{version}:{status}"
+
+
+async def get_task_list_version(user_id: int) -> Optional[int]:
+    """
+    Return a user's task-list version (0 until the first mutation), or None
+    if Redis is unavailable.
+
+    A filler reads the version before querying the database and stores its
+    result under that version. If a mutation lands in between, the result
+    goes to a key no reader asks for anymore, instead of overwriting the
+    invalidation with the pre-mutation listing.
+    """
+    try:
+        version = await _redis().get(task_list_version_key(user_id))
+    except redis.RedisError:
+        return None
+    return int(version) if version is not None else 0
+
+
+async def get_task_list(user_id: int, status: str, version: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Return the cached task list for a user at a version, or None on a miss.
+    """
+    try:
+        cached = await _redis().get(task_list_key(user_id, status, version))
+    except redis.RedisError:
+        return None
+    if cached is None:
+        return None
+    return orjson.loads(cached)
+
+
+async def set_task_list(user_id: int, status: str, version: int, task_list: List[Dict[str, Any]]) -> None:
+    """Store a user's task list, as read at version, in the cache."""
+    try:
+        await _redis().setex(task_list_key(user_id, status, version), TASK_LIST_TTL, orjson.dumps(task_list))
+    except redis.RedisError:
+        pass
+
+
+async def invalidate_task_lists(user_id: int) -> None:
+    """
+    Invalidate every cached task listing for a user after a mutation by
+    moving them to a new version; the old entries expire on their own.
+    """
+    try:
+        await _redis().incr(task_list_version_key(user_id))
+    except redis.RedisError:
+        pass
+
+
+async def acquire_fill_lock(key: str) -> bool:
+    """
+    Take the refill lock for a key (SET NX EX) so only one caller hits the DB.
+
+    Returns True when the lock was taken, or when Redis is unavailable.
+    """
+    try:
+        return bool(await _redis().set(f"lock:{key}", "1", nx=True, ex=FILL_LOCK_TTL))
+    except redis.RedisError:
+        return True
+
+
+async def release_fill_lock(key: str) -> None:
+    """Release a refill lock taken with acquire_fill_lock."""
+    try:
+        await _redis().delete(f"lock:{key}")
+    except redis.RedisError:
+        pass
+
+
+async def wait_for_task_list(
+    user_id: int, status: str, version: int, retries: int = 5, delay: float = 0.05
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Poll the cache briefly while another caller refills it.
+
+    Returns the task list once it appears, or None if it never does.
+    """
+    for _ in range(retries):
+        await asyncio.sleep(delay)
+        task_list = await get_task_list(user_id, status, version)
+        if task_list is not None:
+            return task_list
+    return None
+
+
+def conversation_key(conversation_id: int) -> str:
+    """Build the cache key for a conversation's message history."""
+    return f"conv:v1:{conversation_id}"
+
+
+async def get_conversation_history(conversation_id: int) -> Optional[List[Dict[str, str]]]:
+    """
+    Return the cached message history for a conversation, or None on a miss.
+    """
+    try:
+        entries = await _redis().lrange(conversation_key(conversation_id), 0, -1)
+    except redis.RedisError:
+        return None
+    if not entries:
+        return None
+    return [orjson.loads(entry) for entry in entries]
+
+
+async def set_conversation_history(conversation_id: int, messages: List[Dict[str, str]]) -> None:
+    """Replace the cached history for a conversation."""
+    if not messages:
+        return
+    key = conversation_key(conversation_id)
+    try:
+        async with _redis().pipeline() as pipe:
+            pipe.delete(key)
+            pipe.rpush(key, *[orjson.dumps(message) for message in messages])
+            pipe.expire(key, CONVERSATION_TTL)
+            await pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+async def append_conversation_messages(conversation_id: int, messages: List[Dict[str, str]]) -> None:
+    """
+    Append new messages to a cached history.
+
+    Uses RPUSHX so nothing is written when the history is not cached yet;
+    a partial list would otherwise be served as the full conversation.
+    """
+    if not messages:
+        return
+    key = conversation_key(conversation_id)
+    try:
+        async with _redis().pipeline() as pipe:
+            pipe.rpushx(key, *[orjson.dumps(message) for message in messages])
+            pipe.expire(key, CONVERSATION_TTL)
+            await pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+async def acquire_conversation_lock(conversation_id: int, retries: int = 20, delay: float = 0.05) -> Optional[str]:
+    """
+    Serialize agent turns on a conversation across worker processes.
+
+    Retries SET NX EX with exponential backoff (capped at 1s).
+
+    Returns:
+        A token to pass to release_conversation_lock, or None if the lock
+        could not be taken (or Redis is unavailable) and the turn should
+        proceed unlocked.
+    """
+    key = f"lock:{conversation_key(conversation_id)}"
+    token = uuid.uuid4().hex
+    for attempt in range(retries):
+        try:
+            if await _redis().set(key, token, nx=True, ex=CONVERSATION_LOCK_TTL):
+                return token
+        except redis.RedisError:
+            logger.debug("Redis unavailable; conversation %s turn runs unlocked", conversation_id)
+            return None
+        await asyncio.sleep(min(delay * 2 ** attempt, 1.0))
+    logger.warning(
+        "Conversation %s lock still held after %d attempts; running the turn unlocked",
+        conversation_id, retries
+    )
+    return None
+
+
+async def extend_conversation_lock(conversation_id: int, token: str) -> bool:
+    """
+    Reset a held lock's TTL to CONVERSATION_LOCK_TTL.
+
+    Returns:
+        False if the lock has expired or been taken by another holder
+    """
+    try:
+        return bool(await _redis().eval(
+            _EXTEND_LOCK_SCRIPT, 1, f"lock:{conversation_key(conversation_id)}", token, CONVERSATION_LOCK_TTL
+        ))
+    except redis.RedisError:
+        return False
+
+
+async def release_conversation_lock(conversation_id: int, token: str) -> None:
+    """Release a lock taken with acquire_conversation_lock."""
+    try:
+        await _redis().eval(_RELEASE_LOCK_SCRIPT, 1, f"lock:{conversation_key(conversation_id)}", token)
+    except redis.RedisError:
+        pass
+
+
+async def _keep_conversation_lock(conversation_id: int, token: str) -> None:
+    """Extend a held lock every third of its TTL until cancelled or lost."""
+    while True:
+        await asyncio.sleep(CONVERSATION_LOCK_TTL / 3)
+        if not await extend_conversation_lock(conversation_id, token):
+            logger.warning("Lost the lock on conversation %s during a turn", conversation_id)
+            return
+
+
+@asynccontextmanager
+async def hold_conversation_lock(conversation_id: int) -> AsyncIterator[Optional[str]]:
+    """
+    Hold the conversation lock for the duration of the block, refreshing
+    its TTL in the background so a long turn doesn't outlive it.
+
+    Yields the lock token, or None when the turn proceeds unlocked (see
+    acquire_conversation_lock).
+    """
+    token = await acquire_conversation_lock(conversation_id)
+    if token is None:
+        yield None
+        return
+    keeper = asyncio.create_task(_keep_conversation_lock(conversation_id, token))
+    try:
+        yield token
+    finally:
+        keeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await keeper
+        await release_conversation_lock(conversation_id, token)
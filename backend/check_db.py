@@ -1,16 +1,17 @@
-import sqlite3
+from sqlalchemy import MetaData, Table, inspect
+from sqlalchemy.schema import CreateTable
+
+from db import engine
+
 
 def check_schema():
-    conn = sqlite3.connect('todo.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='users';")
-    schema = cursor.fetchone()
-    if schema:
-        print("Schema for users table:")
-        print(schema[0])
-    else:
+    # Goes through the app's engine, so this works against SQLite or PostgreSQL
+    if not inspect(engine).has_table("users"):
         print("Table users not found.")
-    conn.close()
+        return
+    users = Table("users", MetaData(), autoload_with=engine)
+    print("Schema for users table:")
+    print(CreateTable(users).compile(engine))
 
 if __name__ == "__main__":
     check_schema()
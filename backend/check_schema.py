@@ -1,24 +1,19 @@
-import sqlite3
+from sqlalchemy import MetaData, Table, inspect
+from sqlalchemy.schema import CreateTable
 
-# Connect to the database
-conn = sqlite3.connect('todo.db')
-cursor = conn.cursor()
+from db import engine
 
-# Get table info for users
-cursor.execute("PRAGMA table_info(users);")
-table_info = cursor.fetchall()
+# Inspect through the app's engine, so this works against SQLite or PostgreSQL
+inspector = inspect(engine)
 
-print("Users table schema:")
-for column in table_info:
-    print(f"  {column}")
+if inspector.has_table("users"):
+    print("Users table schema:")
+    for column in inspector.get_columns("users"):
+        print(f"  {column}")
 
-# Also check the SQL used to create the table
-cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='users';")
-create_sql = cursor.fetchone()
-if create_sql:
+    # Also show the CREATE statement for the table
+    users = Table("users", MetaData(), autoload_with=engine)
     print(f"\nCREATE statement for users table:")
-    print(create_sql[0])
+    print(CreateTable(users).compile(engine))
 else:
-    print("\nUsers table not found in sqlite_master")
-
-conn.close()
\ No newline at end of file
+    print("\nUsers table not found")
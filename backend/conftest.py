@@ -0,0 +1,36 @@
+import importlib
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Run the suite with raiseload("*") on API queries (see database/connection.py)
+# so an accidental lazy load fails the test that triggers it
+os.environ.setdefault("ENV", "test")
+
+# A throwaway SQLite file, so tests neither need a server nor touch the
+# committed todo.db; set before database/connection.py reads it
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_TEST_DB_DIR, "test.db")
+
+# The app imports these packages flat (`from db import ...`, run from
+# backend/) while the agents import them as backend.*. Point the flat names
+# at the backend.* modules so one pytest process has a single set of tables
+# and a single engine instead of "Table 'users' is already defined"
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+for _name in ("models", "models.todo_models", "database", "database.connection", "database.deps"):
+    sys.modules.setdefault(_name, importlib.import_module("backend." + _name))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_test_tables():
+    """Build the test database once per run through the migrations, as startup does."""
+    from backend.database.connection import engine
+    from main import create_tables
+
+    create_tables()
+    yield
+    engine.dispose()
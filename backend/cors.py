@@ -0,0 +1,73 @@
+"""
+CORS Middleware
+
+A plain ASGI CORS layer for a fixed list of frontend origins. Origins are
+matched against a frozenset and the response headers are prebuilt as
+bytes, so a request only costs a header scan and a set lookup. Preflight
+requests are answered directly without reaching the app.
+"""
+
+from typing import Iterable
+
+# Methods allowed on preflight; mirrors allow_methods=["*"]
+ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = b"600"
+
+
+class FastCORSMiddleware:
+    """
+    CORS with credentials for an explicit set of origins.
+
+    Requests from other origins pass through untouched, without CORS
+    headers, so the browser blocks them.
+    """
+
+    def __init__(self, app, origins: Iterable[str]):
+        self.app = app
+        self.origins = frozenset(origin.encode() for origin in origins)
+        self.headers_common = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None or origin not in self.origins:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), *self.headers_common]
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = cors_headers + [
+                (b"access-control-allow-methods", ALLOW_METHODS),
+                (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+                (b"content-length", b"2"),
+                (b"content-type", b"text/plain; charset=utf-8"),
+            ]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
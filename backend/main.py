@@ -1,55 +1,171 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Form, Body
+from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlmodel import Session, select
-from typing import List, Dict, Any, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 import os
+import json
 import asyncio
-
-from db import get_session, engine
-from models.todo_models import Task, TaskCreate, TaskUpdate, TaskRead, User, Conversation, Message, MessageRole
-from tasks_crud import get_user_tasks, get_task_by_id, create_task_for_user, update_task, delete_task
+import anyio
+import httpx
+import orjson
+from openai import AsyncOpenAI
+
+from db import STRICT_LOADING, WEB_CONCURRENCY, AsyncSessionLocal, get_async_session, engine, warm_pool
+from models.todo_models import TaskCreate, TaskUpdate, TaskRead, User, Conversation, Message, MessageRole
+from tasks_crud import get_user_tasks, create_task_for_user, update_task, delete_task
 from auth import get_current_user
-from sqlmodel import SQLModel
+from mcp_server import get_tool_definitions, execute_tool
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import bindparam, inspect, update
+from sqlalchemy.orm import aliased, raiseload
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import func
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+# Set by the __main__ launcher once it has run on_startup itself, so the
+# worker processes it spawns don't each repeat it
+STARTUP_DONE_ENV = "TODO_API_STARTUP_DONE"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Migrate the schema and seed default users, then open a few of this
+    worker's async connections so the first requests don't pay for connecting.
+    """
+    if os.getenv(STARTUP_DONE_ENV) != "1":
+        await anyio.to_thread.run_sync(on_startup)
+    await warm_pool()
+    yield
 
-app = FastAPI(title="Todo API", version="1.0.0")
+
+# orjson encodes response bodies in one C-level pass
+app = FastAPI(title="Todo API", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware
-from fastapi.middleware.cors import CORSMiddleware
+from cors import FastCORSMiddleware
 
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000", "https://localhost:3000", "https://127.0.0.1:3000", "http://127.0.0.1:8000", "http://localhost:8000"],  # Frontend URLs
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
+    FastCORSMiddleware,
+    origins=["http://localhost:3000", "http://127.0.0.1:3000", "https://localhost:3000", "https://127.0.0.1:3000", "http://127.0.0.1:8000", "http://localhost:8000"],  # Frontend URLs
 )
 
+# Compress task listings and chat replies over 1 KB; added last so it is the
+# outermost layer and compresses the final response bytes
+from fastapi.middleware.gzip import GZipMiddleware
+
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    """
+    The process-wide OpenAI client, so chat requests reuse its kept-alive
+    connections instead of building a client and TLS session per request.
+    Built on first use, so only the chat endpoints need OPENAI_API_KEY.
+    """
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30,
+        ),
+    )
+
+# At most 8 tool calls from one reply run at once, so a reply with many
+# calls can't take the whole DB pool
+TOOL_LIMITER = anyio.CapacityLimiter(8)
+
 # JWT and password hashing setup
 from passlib.context import CryptContext
-from jose import jwt
-from datetime import datetime, timedelta
-
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+import base64
+import hashlib
+import hmac
+from datetime import datetime
+
+# Argon2id pinned to OWASP's 46 MiB profile (m=47104 KiB, t=2, p=1) so the
+# hash cost doesn't drift with passlib's defaults. Hashes made with other
+# parameters still verify and are upgraded on the user's next login.
+# PASSWORD_HASH_PROFILE=fast selects a minimal-cost profile for test runs only
+if os.getenv("PASSWORD_HASH_PROFILE") == "fast":
+    ARGON2_TIME_COST, ARGON2_MEMORY_COST = 1, 8
+else:
+    ARGON2_TIME_COST, ARGON2_MEMORY_COST = 2, 47104
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=1,
+)
 SECRET_KEY = os.getenv("BETTER_AUTH_SECRET", "your-super-secret-key-change-in-production")
 ALGORITHM = "HS256"
 
+# Each argon2 hash holds 46 MiB, so at most one per core runs at a time
+# instead of one per threadpool slot
+HASH_LIMITER = anyio.CapacityLimiter(max(1, os.cpu_count() or 1))
+# Verified against when the email is unknown, so a miss costs the same as a
+# wrong password and response time doesn't reveal which emails exist
+DUMMY_HASH = pwd_context.hash("dummy-password-for-timing")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password, hashed_password):
+    """
+    Verify a password and return (ok, new_hash); new_hash is set when the
+    stored hash uses outdated parameters and should be replaced.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+# HS256 token minting without jose: the header never changes, and the HMAC
+# key schedule is done once and copied per token. auth.verify_token still
+# decodes with jose, which accepts these as standard compact JWS
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_JWT_SIGNER = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+
 def create_access_token(data: dict):
-    to_encode = data.copy()
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(data))
+    signer = _JWT_SIGNER.copy()
+    signer.update(signing_input)
+    return (signing_input + b"." + _b64url(signer.digest())).decode()
+
+# Migrations live next to this file, so startup works from any directory
+ALEMBIC_DIR = os.path.dirname(os.path.abspath(__file__))
+# The schema create_all built before migrations existed
+ALEMBIC_INITIAL_REVISION = "0001"
 
 def create_tables():
     """
-    Create all database tables
+    Bring the database schema up to date; the same as running
+    `alembic upgrade head` from backend/
+
+    A database whose tables predate migrations (no alembic_version table)
+    is stamped at the initial revision first, so only the later revisions
+    are applied to it and its data is kept.
     """
-    # Drop all existing tables and recreate them to ensure correct schema
-    SQLModel.metadata.drop_all(engine)
-    SQLModel.metadata.create_all(engine)
+    config = Config(os.path.join(ALEMBIC_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ALEMBIC_DIR, "alembic"))
+    # Leave the server's logging configuration alone
+    config.attributes["configure_logger"] = False
+
+    tables = inspect(engine).get_table_names()
+    if tables and "alembic_version" not in tables:
+        command.stamp(config, ALEMBIC_INITIAL_REVISION)
+    command.upgrade(config, "head")
 
 def create_default_users(db: Session):
     """
@@ -73,44 +189,50 @@ def create_default_users(db: Session):
         }
     ]
 
-    # Process each user individually to ensure proper ID assignment
-    for user_data in default_users:
-        existing_user = db.exec(select(User).where(User.email == user_data["email"])).first()
-
-        if not existing_user:
-            # Hash the password
-            hashed_password = get_password_hash(user_data["password"])
-
-            # Create new user
-            user = User(
-                email=user_data["email"],
-                name=user_data["name"],
-                password=hashed_password
-            )
-
-            db.add(user)
-            db.commit()  # Commit each user individually to trigger ID generation
-            db.refresh(user)  # Refresh to get the generated ID
+    # One SELECT for the users already present
+    emails = [user_data["email"] for user_data in default_users]
+    existing = set(db.exec(select(User.email).where(User.email.in_(emails))).all())
+    for email in existing:
+        print(f"Default user already exists: {email}")
+
+    missing = [user_data for user_data in default_users if user_data["email"] not in existing]
+    if missing:
+        # argon2 releases the GIL, so the hashes are computed in parallel
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            hashed_passwords = list(executor.map(get_password_hash, [user_data["password"] for user_data in missing]))
+
+        # Core inserts skip the model's default_factory, so stamp the rows here
+        now = datetime.utcnow()
+        rows = [
+            {
+                "email": user_data["email"],
+                "name": user_data["name"],
+                "password": hashed_password,
+                "created_at": now,
+                "updated_at": now
+            }
+            for user_data, hashed_password in zip(missing, hashed_passwords)
+        ]
+        # One multi-row INSERT; ON CONFLICT covers another worker seeding concurrently
+        insert = postgresql_insert if engine.dialect.name == "postgresql" else sqlite_insert
+        db.exec(insert(User).values(rows).on_conflict_do_nothing(index_elements=["email"]))
+        db.commit()
+        for user_data in missing:
             print(f"Created default user: {user_data['email']}")
-        else:
-            print(f"Default user already exists: {user_data['email']}")
 
     print("Default users setup completed")
 
 def on_startup():
-    # Create tables
+    # Apply pending migrations (alembic upgrade head)
     create_tables()
 
-    # Create default users
+    # Create default users; a database that already has users is taken as
+    # seeded, so a normal boot costs one COUNT query
     with Session(engine) as session:
-        create_default_users(session)
+        if session.exec(select(func.count()).select_from(User)).one() == 0:
+            create_default_users(session)
 
 
-# Register the startup event
-@app.on_event("startup")
-def startup_event():
-    on_startup()
-
 # Define Pydantic models for request body
 from pydantic import BaseModel
 
@@ -135,22 +257,53 @@ class ChatResponse(BaseModel):
     response: str
     conversation_id: int
 
+
+# Hot lookups built once with bound parameters, so each request reuses the
+# statement and SQLAlchemy's compiled form instead of rebuilding both
+# Auth only needs a few columns; selecting them as plain rows skips building
+# and tracking a User instance
+_SELECT_LOGIN_BY_EMAIL = select(User.id, User.email, User.name, User.password).where(User.email == bindparam("email"))
+_SELECT_USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+
+# Ownership check only; the id is all that's needed, so no Conversation
+# instance is built
+_SELECT_CONV_BY_ID_USER = (
+    select(Conversation.id)
+    .where(Conversation.id == bindparam("cid"))
+    .where(Conversation.user_id == bindparam("uid"))
+)
+
+# Last 10 messages of a conversation, newest-first through the
+# (conversation_id, created_at) index, then re-sorted oldest-first in SQL
+_RECENT_MESSAGES = (
+    select(Message)
+    .where(Message.conversation_id == bindparam("cid"))
+    .order_by(Message.created_at.desc(), Message.id.desc())
+    .limit(10)
+    .subquery()
+)
+_RecentMessage = aliased(Message, _RECENT_MESSAGES)
+_SELECT_RECENT_MESSAGES = select(_RecentMessage).order_by(_RecentMessage.created_at, _RecentMessage.id)
+if STRICT_LOADING:
+    # Only role and content are read; fail on any relationship access
+    _SELECT_RECENT_MESSAGES = _SELECT_RECENT_MESSAGES.options(raiseload("*"))
+
 @app.post("/auth/register", response_model=dict)
-def register_user(
+async def register_user(
     register_data: RegisterRequest,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.exec(select(User).where(User.email == register_data.email)).first()
-    if existing_user:
+    email_taken = (await db.exec(_SELECT_USER_ID_BY_EMAIL, params={"email": register_data.email})).first() is not None
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Hash the password
-    hashed_password = get_password_hash(register_data.password)
+    # Hash the password off the event loop; argon2 is CPU-bound
+    hashed_password = await anyio.to_thread.run_sync(get_password_hash, register_data.password, limiter=HASH_LIMITER)
 
     # Create new user
     user = User(
@@ -160,8 +313,7 @@ def register_user(
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     # Create access token
     token_data = {"sub": str(user.id), "email": user.email}
@@ -171,57 +323,79 @@ def register_user(
 
 
 @app.post("/auth/login", response_model=dict)
-def login_user(
+async def login_user(
     login_data: LoginRequest,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Authenticate user and return access token."""
     # Find user by email
-    user = db.exec(select(User).where(User.email == login_data.email)).first()
-    if not user or not verify_password(login_data.password, user.password):
+    user = (await db.exec(_SELECT_LOGIN_BY_EMAIL, params={"email": login_data.email})).first()
+    password_ok, new_hash = await anyio.to_thread.run_sync(
+        verify_and_update_password, login_data.password, user.password if user else DUMMY_HASH, limiter=HASH_LIMITER
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Re-hash with the current parameters while the plain password is at hand
+    if new_hash is not None:
+        await db.exec(update(User).where(User.id == user.id).values(password=new_hash))
+        await db.commit()
+
     # Create access token
     token_data = {"sub": str(user.id), "email": user.email}
     access_token = create_access_token(data=token_data)
 
     return {"access_token": access_token, "token_type": "bearer", "user": {"id": user.id, "email": user.email, "name": user.name}}
 
+def parse_user_id(current_user_id: str) -> int:
+    """
+    The token's user id as the int the user_id columns hold; asyncpg won't
+    bind a str to an integer parameter.
+    """
+    try:
+        return int(current_user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user ID"
+        )
+
+
 @app.get("/api/tasks", response_model=List[TaskRead])
-def list_tasks(
+async def list_tasks(
     status_filter: str = "all",
     current_user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List all tasks for authenticated user."""
-    tasks = get_user_tasks(db, current_user_id, status_filter)
+    tasks = await get_user_tasks(db, parse_user_id(current_user_id), status_filter)
     return tasks
 
 
 @app.post("/api/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
     current_user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Create a new task."""
-    task = create_task_for_user(db, task_data, current_user_id)
+    task = await create_task_for_user(db, task_data, parse_user_id(current_user_id))
     return task
 
 
 @app.put("/api/tasks/{task_id}", response_model=TaskRead)
-def update_task_endpoint(
+async def update_task_endpoint(
     task_id: int,
     task_update: TaskUpdate,
     current_user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Update a task."""
-    task = update_task(db, task_id, current_user_id, task_update)
+    task = await update_task(db, task_id, parse_user_id(current_user_id), task_update)
 
     if not task:
         raise HTTPException(
@@ -233,13 +407,13 @@ def update_task_endpoint(
 
 
 @app.delete("/api/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task_endpoint(
+async def delete_task_endpoint(
     task_id: int,
     current_user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Delete a task."""
-    success = delete_task(db, task_id, current_user_id)
+    success = await delete_task(db, task_id, parse_user_id(current_user_id))
 
     if not success:
         raise HTTPException(
@@ -252,12 +426,12 @@ def delete_task_endpoint(
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Todo API is running!"}
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy", "message": "Todo API is running!"}
 
 
@@ -265,7 +439,7 @@ def health_check():
 async def chat_with_assistant(
     chat_request: ChatRequest,
     current_user_id: str = Depends(get_current_user),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     AI Agent Chat Endpoint (specs/features/ai_agent.md)
@@ -281,57 +455,91 @@ async def chat_with_assistant(
     NO string matching - uses OpenAI Tool Calling exclusively.
     Stateless - all history loaded from database per request.
     """
-    user_message = chat_request.message
-    conversation_id = chat_request.conversation_id
-
-    # Validate user_id
-    try:
-        user_id_int = int(current_user_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid user ID"
-        )
-
-    # If no conversation_id is provided, create a new conversation
-    if not conversation_id:
-        conversation = Conversation(user_id=user_id_int)
-        db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
-        conversation_id = conversation.id
-    else:
-        # Verify conversation exists and belongs to user
-        conversation = db.exec(
-            select(Conversation)
-            .where(Conversation.id == conversation_id)
-            .where(Conversation.user_id == user_id_int)
-        ).first()
-        if not conversation:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Conversation not found"
-            )
+    user_id_int, conversation_id = await resolve_chat_conversation(
+        db, current_user_id, chat_request.conversation_id
+    )
 
     # Process via OpenAI with Tool Calling (follows specs/features/ai_agent.md)
     result = await run_agent_for_chat(
         user_id=user_id_int,
-        user_message=user_message,
+        user_message=chat_request.message,
         conversation_id=conversation_id,
         db=db
     )
 
+    # One commit for the whole turn; any failure above leaves nothing written
+    await db.commit()
+
     return ChatResponse(
         response=result["response"],
         conversation_id=result["conversation_id"]
     )
 
 
+@app.post("/api/chat/stream")
+async def chat_with_assistant_stream(
+    chat_request: ChatRequest,
+    current_user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Streaming variant of /api/chat.
+
+    Same Request Flow, but the final reply is sent as Server-Sent Events
+    while it is generated: `{"delta": ...}` events, then one
+    `{"done": true, "conversation_id": ...}` event once the turn is saved.
+    """
+    user_id_int, conversation_id = await resolve_chat_conversation(
+        db, current_user_id, chat_request.conversation_id
+    )
+    messages = await build_chat_messages(db, conversation_id, chat_request.message)
+    # The stream saves the turn in its own session; don't keep this one's
+    # connection checked out for the length of the stream
+    await db.close()
+
+    return StreamingResponse(
+        stream_agent_for_chat(user_id_int, chat_request.message, conversation_id, messages),
+        media_type="text/event-stream"
+    )
+
+
+async def resolve_chat_conversation(
+    db: AsyncSession,
+    current_user_id: str,
+    conversation_id: Optional[int]
+) -> Tuple[int, Optional[int]]:
+    """
+    Validate the user id and the conversation's ownership.
+
+    Returns (user_id, conversation_id); conversation_id is None when a new
+    conversation should be created with the turn's messages.
+    """
+    user_id_int = parse_user_id(current_user_id)
+
+    # If no conversation_id is provided, a new conversation is created
+    # together with its first messages, after the OpenAI round-trip, so no
+    # write transaction is held open while waiting on the model
+    if not conversation_id:
+        return user_id_int, None
+
+    # Verify conversation exists and belongs to user
+    owned = (await db.exec(
+        _SELECT_CONV_BY_ID_USER,
+        params={"cid": conversation_id, "uid": user_id_int}
+    )).first() is not None
+    if not owned:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+    return user_id_int, conversation_id
+
+
 async def run_agent_for_chat(
     user_id: int,
     user_message: str,
-    conversation_id: int,
-    db: Session
+    conversation_id: Optional[int],
+    db: AsyncSession
 ) -> Dict[str, Any]:
     """
     Implements the Request Flow from specs/features/ai_agent.md
@@ -346,22 +554,77 @@ async def run_agent_for_chat(
 
     NO string matching - relies entirely on OpenAI Tool Calling.
     """
-    import os
-    from openai import OpenAI
-    from mcp_server import get_tool_definitions, execute_tool
+    messages = await build_chat_messages(db, conversation_id, user_message)
+    # Hand the connection back to the pool while waiting on OpenAI; the
+    # session checks out a fresh one for the writes in step 6
+    await db.close()
+
+    assistant_response = await run_chat_tools(messages, user_id)
+    if assistant_response is None:
+        # Generate final natural language response
+        final_response = await get_openai_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages
+        )
+        assistant_response = final_response.choices[0].message.content
+
+    conversation_id = await persist_chat_turn(db, user_id, conversation_id, user_message, assistant_response)
+
+    return {
+        "response": assistant_response,
+        "conversation_id": conversation_id
+    }
+
+
+async def stream_agent_for_chat(
+    user_id: int,
+    user_message: str,
+    conversation_id: Optional[int],
+    messages: List[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Run steps 4-6 for a streamed chat turn, yielding SSE events.
 
-    # Initialize OpenAI client
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    A reply given without tool calls is already complete and is sent as a
+    single delta; after tool calls the final reply is streamed token by token.
+    """
+    assistant_response = await run_chat_tools(messages, user_id)
+    if assistant_response is not None:
+        yield _sse_event({"delta": assistant_response})
+    else:
+        parts = []
+        stream = await get_openai_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            stream=True
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield _sse_event({"delta": delta})
+        assistant_response = "".join(parts)
+
+    # The request's session is closed once the response starts streaming,
+    # so the turn is saved in a session of its own
+    async with AsyncSessionLocal() as db:
+        conversation_id = await persist_chat_turn(db, user_id, conversation_id, user_message, assistant_response)
+        await db.commit()
+    yield _sse_event({"done": True, "conversation_id": conversation_id})
 
+
+def _sse_event(payload: Dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Events message."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def build_chat_messages(db: AsyncSession, conversation_id: Optional[int], user_message: str) -> List[Dict[str, Any]]:
+    """Build the OpenAI messages for a turn: system prompt, history, user message."""
     # STEP 2: Retrieve Context - Fetch last 10 messages from Message table
-    messages_query = (
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.desc())
-        .limit(10)
-    )
-    history_messages = db.exec(messages_query).all()
-    history_messages = list(reversed(history_messages))  # Chronological order
+    # (already in chronological order; a new conversation has none)
+    history_messages = []
+    if conversation_id is not None:
+        history_messages = (await db.exec(_SELECT_RECENT_MESSAGES, params={"cid": conversation_id})).all()
 
     # STEP 3: System Prompt (exact text from specs/features/ai_agent.md)
     system_prompt = """You are a helpful Todo Assistant. You act on behalf of the user. If the user wants to add, view, or modify tasks, you MUST call the provided tools. Do not ask for confirmation unless necessary."""
@@ -376,11 +639,24 @@ async def run_agent_for_chat(
         })
 
     messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+async def run_chat_tools(messages: List[Dict[str, Any]], user_id: int) -> Optional[str]:
+    """
+    Ask the model for a decision and run any tools it calls.
+
+    Returns the reply when the model answered directly. Otherwise the tool
+    calls and their results are appended to messages and None is returned;
+    the final reply is then generated from messages.
+    """
+    # Shared AsyncOpenAI client, awaited so the event loop is free during the call
+    client = get_openai_client()
 
     # STEP 4: AI Decision - Send User Message + History + Tools to OpenAI
     tools = get_tool_definitions()
 
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=messages,
         tools=tools,
@@ -391,55 +667,68 @@ async def run_agent_for_chat(
 
     # STEP 5: Tool Execution
     # CRITICAL: If OpenAI returns tool_call, execute Python function immediately
-    if response_message.tool_calls:
-        messages.append(response_message)
-
-        # Execute each tool call
-        for tool_call in response_message.tool_calls:
-            function_name = tool_call.function.name
-            import json
-            function_args = json.loads(tool_call.function.arguments)
-
-            # Execute the tool from mcp_server.py
-            tool_result = execute_tool(function_name, function_args, user_id)
-
-            # Send result back to OpenAI
-            messages.append({
-                "role": "tool",
-                "tool_call_id": tool_call.id,
-                "name": function_name,
-                "content": tool_result
-            })
+    if not response_message.tool_calls:
+        # No tool calls - direct response
+        return response_message.content
 
-        # Generate final natural language response
-        final_response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages
-        )
+    messages.append(response_message)
+
+    def run_tool_call(tool_call):
+        # Execute the tool from mcp_server.py (sync; opens its own session)
+        return execute_tool(tool_call.function.name, json.loads(tool_call.function.arguments), user_id)
+
+    # Execute the tool calls concurrently on worker threads
+    tool_results = await asyncio.gather(*[
+        anyio.to_thread.run_sync(run_tool_call, tool_call, limiter=TOOL_LIMITER)
+        for tool_call in response_message.tool_calls
+    ])
+
+    # Send results back to OpenAI, in the order the calls were made
+    for tool_call, tool_result in zip(response_message.tool_calls, tool_results):
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "name": tool_call.function.name,
+            "content": tool_result
+        })
+    return None
 
-        assistant_response = final_response.choices[0].message.content
-    else:
-        # No tool calls - direct response
-        assistant_response = response_message.content
 
+async def persist_chat_turn(
+    db: AsyncSession,
+    user_id: int,
+    conversation_id: Optional[int],
+    user_message: str,
+    assistant_response: str
+) -> int:
+    """
+    Add a turn's messages to the session, creating the conversation if needed.
+
+    Returns the conversation id. The caller commits.
+    """
     # STEP 6: Persist - Save User message and final Assistant response to DB
+    if conversation_id is None:
+        conversation = Conversation(user_id=user_id)
+        db.add(conversation)
+        await db.flush()  # Assigns the conversation's id without committing
+        conversation_id = conversation.id
     save_chat_messages(db, conversation_id, user_message, assistant_response)
-
-    return {
-        "response": assistant_response,
-        "conversation_id": conversation_id
-    }
+    return conversation_id
 
 
 def save_chat_messages(db: Session, conversation_id: int, user_message: str, assistant_response: str):
-    """Save user and assistant messages to the database."""
+    """
+    Add user and assistant messages to the session.
+
+    Does not commit, so the messages land in the caller's transaction.
+    Only calls add_all, which does no I/O, so an AsyncSession works too.
+    """
     # Save user message
     user_msg = Message(
         conversation_id=conversation_id,
         role=MessageRole.user,
         content=user_message
     )
-    db.add(user_msg)
 
     # Save assistant message
     assistant_msg = Message(
@@ -447,11 +736,28 @@ def save_chat_messages(db: Session, conversation_id: int, user_message: str, ass
         role=MessageRole.assistant,
         content=assistant_response
     )
-    db.add(assistant_msg)
-    db.commit()
+
+    # Added together so the flush writes both rows in one batched INSERT
+    db.add_all([user_msg, assistant_msg])
 
 
 # For running with uvicorn
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+
+    # Schema and default users are set up once here, before the workers start
+    on_startup()
+    os.environ[STARTUP_DONE_ENV] = "1"
+
+    # uvloop has no Windows build; fall back to the asyncio loop there
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # The same count the connection pools are sized for
+        workers=WEB_CONCURRENCY,
+        log_level="warning",
+    )
\ No newline at end of file
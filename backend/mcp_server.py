@@ -7,19 +7,24 @@ Based on specs/api/mcp-tools.md
 
 from mcp.server.fastmcp import FastMCP
 from sqlmodel import Session, select
-from typing import Optional
-import json
+from sqlalchemy import bindparam
+import orjson
 
 from db import engine
-from models.todo_models import Task, TaskCreate, TaskUpdate, TaskStatus
+from models.todo_models import Task, TaskStatus
 
 # Initialize FastMCP server
 mcp = FastMCP("Todo MCP Server")
 
 
+def _dump(result) -> str:
+    """Encode a tool result as a JSON string; enums and datetimes are handled by orjson."""
+    return orjson.dumps(result).decode()
+
+
 def get_db_session():
     """Get a database session"""
-    return Session(engine)
+    return Session(engine, expire_on_commit=False)
 
 
 @mcp.tool()
@@ -44,7 +49,6 @@ def add_task(title: str, description: str = None, user_id: int = 1) -> str:
         )
         db.add(task)
         db.commit()
-        db.refresh(task)
 
         result = {
             "success": True,
@@ -53,7 +57,25 @@ def add_task(title: str, description: str = None, user_id: int = 1) -> str:
             "status": task.status.value,
             "message": f"Task '{title}' added successfully"
         }
-        return json.dumps(result)
+        return _dump(result)
+
+
+# Status words the model may send, normalized once; None means no filter
+_STATUS_FILTERS = {
+    "all": None,
+    "pending": TaskStatus.pending,
+    "unfinished": TaskStatus.pending,
+    "completed": TaskStatus.completed,
+    "done": TaskStatus.completed,
+    "finished": TaskStatus.completed,
+}
+_UNKNOWN_STATUS = object()
+
+# Only the columns the listing returns, as plain rows
+_LIST_TASKS = select(
+    Task.id, Task.title, Task.description, Task.status, Task.created_at, Task.updated_at
+).where(Task.user_id == bindparam("uid"))
+_LIST_TASKS_BY_STATUS = _LIST_TASKS.where(Task.status == bindparam("status"))
 
 
 @mcp.tool()
@@ -69,30 +91,30 @@ def list_tasks(status: str = "all", user_id: int = 1) -> str:
     Returns:
         A JSON list of tasks including ID, title, and status
     """
-    with get_db_session() as db:
-        query = select(Task).where(Task.user_id == user_id)
-
-        # Apply status filter
-        if status != "all":
-            # Normalize status strings
-            if status.lower() in ["unfinished", "pending"]:
-                query = query.where(Task.status == TaskStatus.pending)
-            elif status.lower() in ["done", "finished", "completed"]:
-                query = query.where(Task.status == TaskStatus.completed)
+    status_filter = _STATUS_FILTERS.get(status.lower(), _UNKNOWN_STATUS)
+    if status_filter is _UNKNOWN_STATUS:
+        return _dump({
+            "success": False,
+            "error": f"Unknown status '{status}'; use all, pending or completed"
+        })
 
-        tasks = db.exec(query).all()
+    with get_db_session() as db:
+        if status_filter is None:
+            rows = db.exec(_LIST_TASKS, params={"uid": user_id}).all()
+        else:
+            rows = db.exec(_LIST_TASKS_BY_STATUS, params={"uid": user_id, "status": status_filter}).all()
 
         # Format tasks for return
         task_list = [
             {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "status": task.status.value,
-                "created_at": task.created_at.isoformat(),
-                "updated_at": task.updated_at.isoformat()
+                "id": task_id,
+                "title": title,
+                "description": description,
+                "status": task_status,
+                "created_at": created_at,
+                "updated_at": updated_at
             }
-            for task in tasks
+            for task_id, title, description, task_status, created_at, updated_at in rows
         ]
 
         result = {
@@ -101,7 +123,7 @@ def list_tasks(status: str = "all", user_id: int = 1) -> str:
             "tasks": task_list,
             "filter": status
         }
-        return json.dumps(result)
+        return _dump(result)
 
 
 @mcp.tool()
@@ -126,13 +148,12 @@ def complete_task(task_id: int, user_id: int = 1) -> str:
                 "success": False,
                 "error": f"Task with ID {task_id} not found"
             }
-            return json.dumps(result)
+            return _dump(result)
 
         # Mark as completed
         task.status = TaskStatus.completed
         db.add(task)
         db.commit()
-        db.refresh(task)
 
         result = {
             "success": True,
@@ -141,7 +162,7 @@ def complete_task(task_id: int, user_id: int = 1) -> str:
             "status": task.status.value,
             "message": f"Task '{task.title}' marked as completed"
         }
-        return json.dumps(result)
+        return _dump(result)
 
 
 @mcp.tool()
@@ -166,7 +187,7 @@ def delete_task(task_id: int, user_id: int = 1) -> str:
                 "success": False,
                 "error": f"Task with ID {task_id} not found"
             }
-            return json.dumps(result)
+            return _dump(result)
 
         # Store title before deletion
         task_title = task.title
@@ -181,7 +202,85 @@ def delete_task(task_id: int, user_id: int = 1) -> str:
             "title": task_title,
             "message": f"Task '{task_title}' has been permanently deleted"
         }
-        return json.dumps(result)
+        return _dump(result)
+
+
+# OpenAI-compatible tool definitions; built once and shared, so read-only
+TOOL_DEFINITIONS = (
+    {
+        "type": "function",
+        "function": {
+            "name": "add_task",
+            "description": "Adds a new task to the database for the current user",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "The task title"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Optional task description"
+                    }
+                },
+                "required": ["title"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_tasks",
+            "description": "List tasks. Use 'pending' for unfinished/pending tasks, 'completed' for done/finished tasks, or 'all' for all tasks",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "status": {
+                        "type": "string",
+                        "enum": ["all", "pending", "completed"],
+                        "description": "Filter by status: 'all', 'pending', or 'completed'"
+                    }
+                },
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "complete_task",
+            "description": "Marks a specific task as completed",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "integer",
+                        "description": "The ID of the task to complete"
+                    }
+                },
+                "required": ["task_id"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_task",
+            "description": "Permanently removes a task",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "integer",
+                        "description": "The ID of the task to delete"
+                    }
+                },
+                "required": ["task_id"]
+            }
+        }
+    }
+)
 
 
 # Function to get tool definitions for OpenAI
@@ -190,83 +289,9 @@ def get_tool_definitions():
     Get OpenAI-compatible tool definitions for function calling
 
     Returns:
-        List of tool definitions in OpenAI format
+        The shared TOOL_DEFINITIONS tuple, in OpenAI format
     """
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "add_task",
-                "description": "Adds a new task to the database for the current user",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "The task title"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Optional task description"
-                        }
-                    },
-                    "required": ["title"]
-                }
-            }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "list_tasks",
-                "description": "List tasks. Use 'pending' for unfinished/pending tasks, 'completed' for done/finished tasks, or 'all' for all tasks",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "status": {
-                            "type": "string",
-                            "enum": ["all", "pending", "completed"],
-                            "description": "Filter by status: 'all', 'pending', or 'completed'"
-                        }
-                    },
-                    "required": []
-                }
-            }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "complete_task",
-                "description": "Marks a specific task as completed",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "integer",
-                            "description": "The ID of the task to complete"
-                        }
-                    },
-                    "required": ["task_id"]
-                }
-            }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "delete_task",
-                "description": "Permanently removes a task",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "integer",
-                            "description": "The ID of the task to delete"
-                        }
-                    },
-                    "required": ["task_id"]
-                }
-            }
-        }
-    ]
+    return TOOL_DEFINITIONS
 
 
 # Function to execute tools (for OpenAI function calling)
@@ -294,7 +319,7 @@ def execute_tool(tool_name: str, arguments: dict, user_id: int) -> str:
     }
 
     if tool_name not in tools:
-        return json.dumps({
+        return _dump({
             "success": False,
             "error": f"Unknown tool: {tool_name}"
         })
@@ -303,7 +328,7 @@ def execute_tool(tool_name: str, arguments: dict, user_id: int) -> str:
     try:
         return tools[tool_name](**arguments)
     except Exception as e:
-        return json.dumps({
+        return _dump({
             "success": False,
             "error": f"Error executing {tool_name}: {str(e)}"
         })
@@ -1,30 +1,18 @@
 import asyncio
-from contextlib import contextmanager
 from mcp.server import Server
 from backend.app.skills.todo_skill import TodoManagementSkill
-from backend.database.connection import Session, engine
+from backend.database.connection import AsyncSession, AsyncSessionLocal
 
 # Create MCP server instance
 server = Server("todo-mcp-server")
 
-@contextmanager
-def get_db_session():
-    """
-    Context manager for database sessions
-    """
-    with Session(engine) as session:
-        try:
-            yield session
-        finally:
-            session.close()
-
 
-def get_skill(session: Session, user_id: int = 1) -> TodoManagementSkill:
+def get_skill(session: AsyncSession, user_id: int = 1) -> TodoManagementSkill:
     """
     Factory function to create a TodoManagementSkill instance.
 
     Args:
-        session: Database session
+        session: Async database session
         user_id: User ID for the skill context (default: 1)
 
     Returns:
@@ -39,9 +27,9 @@ async def add_task_tool(title: str, description: str = "") -> dict:
     """
     Add a new task to the todo list
     """
-    with get_db_session() as session:
+    async with AsyncSessionLocal() as session:
         skill = get_skill(session)
-        return skill.add_task(title, description)
+        return await skill.add_task(title, description)
 
 
 @server.tool("list_tasks")
@@ -49,9 +37,9 @@ async def list_tasks_tool(status: str = "all") -> dict:
     """
     List all tasks or filter by status
     """
-    with get_db_session() as session:
+    async with AsyncSessionLocal() as session:
         skill = get_skill(session)
-        return skill.list_tasks(status)
+        return await skill.list_tasks(status)
 
 
 @server.tool("complete_task")
@@ -59,9 +47,9 @@ async def complete_task_tool(task_id: int) -> dict:
     """
     Mark a task as completed
     """
-    with get_db_session() as session:
+    async with AsyncSessionLocal() as session:
         skill = get_skill(session)
-        return skill.complete_task(task_id)
+        return await skill.complete_task(task_id)
 
 
 @server.tool("delete_task")
@@ -69,9 +57,9 @@ async def delete_task_tool(task_id: int) -> dict:
     """
     Delete a task from the todo list
     """
-    with get_db_session() as session:
+    async with AsyncSessionLocal() as session:
         skill = get_skill(session)
-        return skill.delete_task(task_id)
+        return await skill.delete_task(task_id)
 
 
 @server.tool("update_task")
@@ -79,9 +67,9 @@ async def update_task_tool(task_id: int, title: str = None, description: str = N
     """
     Update a task's details
     """
-    with get_db_session() as session:
+    async with AsyncSessionLocal() as session:
         skill = get_skill(session)
-        return skill.update_task(task_id, title=title, description=description, status=status)
+        return await skill.update_task(task_id, title=title, description=description, status=status)
 
 
 # Initialize the server
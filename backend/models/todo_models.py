@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, func
 from typing import Optional, List
 from datetime import datetime
 import enum
@@ -28,12 +29,33 @@ class Task(SQLModel, table=True):
     description: Optional[str] = None
     status: TaskStatus = Field(default=TaskStatus.pending)
     user_id: int = Field(foreign_key="users.id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Timestamps are set by the database; updated_at is bumped in the UPDATE itself
+    created_at: Optional[datetime] = Field(
+        default=None, nullable=False, sa_column_kwargs={"server_default": func.now()}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()}
+    )
 
     # Relationship to user
     user: User = Relationship()
 
+    # list_tasks filters on user_id and optionally status. On PostgreSQL the
+    # listed columns ride along in the index, so listings are index-only scans
+    __table_args__ = (
+        Index(
+            "ix_task_user_status",
+            "user_id",
+            "status",
+            postgresql_include=["id", "title", "description", "created_at", "updated_at"],
+        ),
+    )
+
+    # Fetch server-generated timestamps via RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
 # Conversation model (from specs/database/schema_update.md)
 class Conversation(SQLModel, table=True):
     __tablename__ = "conversations"
@@ -42,6 +64,10 @@ class Conversation(SQLModel, table=True):
     user_id: int = Field(foreign_key="users.id", index=True)
     title: Optional[str] = Field(default="New Conversation")
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Running summary of the oldest messages, and how many messages (in
+    # created_at, id order) it covers; agents send it instead of those messages
+    summary: Optional[str] = Field(default=None)
+    summarized_count: int = Field(default=0)
 
 # Message model (from specs/database/schema_update.md)
 class MessageRole(str, enum.Enum):
@@ -57,11 +83,18 @@ class Message(SQLModel, table=True):
     conversation_id: int = Field(foreign_key="conversations.id")
     role: MessageRole
     content: str  # text field
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by the database; messages saved in one statement share a timestamp,
+    # so readers order by (created_at, id)
+    created_at: Optional[datetime] = Field(
+        default=None, nullable=False, sa_column_kwargs={"server_default": func.now()}
+    )
 
     # Relationship to conversation
     conversation: Conversation = Relationship()
 
+    # History is always read per conversation in (created_at, id) order
+    __table_args__ = (Index("ix_msg_conv_created", "conversation_id", "created_at", "id"),)
+
 # Pydantic models for API
 class TaskCreate(SQLModel):
     title: str
@@ -1,7 +1,7 @@
 from sqlmodel import Session, select
 from typing import List, Optional
 from backend.models.todo_models import Task, TaskStatus
-from datetime import datetime
+from sqlalchemy import func
 
 def create_task(session: Session, title: str, description: Optional[str] = None, user_id: int = 1) -> Task:
     """
@@ -15,7 +15,6 @@ def create_task(session: Session, title: str, description: Optional[str] = None,
     )
     session.add(task)
     session.commit()
-    session.refresh(task)
     return task
 
 def get_tasks(session: Session, user_id: int = 1, status: Optional[TaskStatus] = None) -> List[Task]:
@@ -47,10 +46,9 @@ def update_task(session: Session, task_id: int, title: Optional[str] = None,
     if status is not None:
         task.status = status
 
-    task.updated_at = datetime.utcnow()
+    task.updated_at = func.now()
     session.add(task)
     session.commit()
-    session.refresh(task)
     return task
 
 def complete_task(session: Session, task_id: int) -> Optional[Task]:
@@ -62,10 +60,9 @@ def complete_task(session: Session, task_id: int) -> Optional[Task]:
         return None
 
     task.status = TaskStatus.completed
-    task.updated_at = datetime.utcnow()
+    task.updated_at = func.now()
     session.add(task)
     session.commit()
-    session.refresh(task)
     return task
 
 def delete_task(session: Session, task_id: int) -> bool:
@@ -11,6 +11,7 @@ import asyncio
 from contextlib import contextmanager
 from typing import Optional, List, Any
 from datetime import datetime
+from sqlalchemy import func
 
 from mcp import Server
 from sqlmodel import Session, select
@@ -31,7 +32,9 @@ def get_db_session():
     Yields:
         Session: SQLModel database session
     """
-    with Session(engine) as session:
+    # expire_on_commit=False: committed objects keep their loaded values,
+    # so responses are built without a refresh() SELECT
+    with Session(engine, expire_on_commit=False) as session:
         try:
             yield session
         finally:
@@ -96,7 +99,6 @@ async def add_task(user_id: str, title: str, description: str = "") -> dict:
             )
             session.add(task)
             session.commit()
-            session.refresh(task)
 
             return {
                 "task_id": task.id,
@@ -133,7 +135,10 @@ async def list_tasks(user_id: str, status: str = "all") -> dict:
             }
 
         try:
-            query = select(Task).where(Task.user_id == user_id_int)
+            # Only the returned columns; rows come back as tuples
+            query = select(
+                Task.id, Task.title, Task.description, Task.status, Task.created_at, Task.updated_at
+            ).where(Task.user_id == user_id_int)
 
             # Apply status filter if not "all"
             if status != "all":
@@ -146,18 +151,19 @@ async def list_tasks(user_id: str, status: str = "all") -> dict:
                         "tasks": []
                     }
 
-            tasks = session.exec(query).all()
-
-            task_list = []
-            for task in tasks:
-                task_list.append({
-                    "task_id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status.value,
-                    "created_at": task.created_at.isoformat() if task.created_at else None,
-                    "updated_at": task.updated_at.isoformat() if task.updated_at else None
-                })
+            iso = datetime.isoformat
+            task_list = [
+                {
+                    "task_id": task_id,
+                    "title": title,
+                    "description": description,
+                    "status": task_status.value,
+                    "created_at": iso(created_at) if created_at else None,
+                    "updated_at": iso(updated_at) if updated_at else None
+                }
+                for task_id, title, description, task_status, created_at, updated_at
+                in session.exec(query)
+            ]
 
             return {"tasks": task_list}
 
@@ -202,10 +208,9 @@ async def update_task(
             if description is not None:
                 task.description = description
 
-            task.updated_at = datetime.utcnow()
+            task.updated_at = func.now()
             session.add(task)
             session.commit()
-            session.refresh(task)
 
             return {
                 "status": "updated",
@@ -244,7 +249,7 @@ async def complete_task(user_id: str, task_id: int) -> dict:
 
         try:
             task.status = TaskStatus.completed
-            task.updated_at = datetime.utcnow()
+            task.updated_at = func.now()
             session.add(task)
             session.commit()
 
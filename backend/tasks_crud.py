@@ -1,23 +1,35 @@
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
-from models.todo_models import Task, TaskCreate, TaskUpdate, TaskRead, TaskStatus, Message, MessageRole
-from datetime import datetime
+from models.todo_models import Task, TaskCreate, TaskUpdate, TaskRead, TaskStatus
+from sqlalchemy import bindparam
+from sqlalchemy.orm import raiseload
+from db import STRICT_LOADING
 
-def get_user_tasks(db: Session, user_id: str, status_filter: str = "all") -> List[TaskRead]:
+# raiseload("*") in dev/test so serializing a task can't lazy-load Task.user
+_LOAD_OPTIONS = (raiseload("*"),) if STRICT_LOADING else ()
+
+# Built once with bound parameters so the compiled form is reused
+_SELECT_USER_TASKS = select(Task).options(*_LOAD_OPTIONS).where(Task.user_id == bindparam("uid"))
+_SELECT_USER_TASKS_BY_STATUS = _SELECT_USER_TASKS.where(Task.status == bindparam("status"))
+_SELECT_TASK_BY_ID = select(Task).options(*_LOAD_OPTIONS).where(Task.id == bindparam("tid")).where(Task.user_id == bindparam("uid"))
+
+async def get_user_tasks(db: AsyncSession, user_id: int, status_filter: str = "all") -> List[TaskRead]:
     """
     Get all tasks for a user, optionally filtered by status
     """
-    query = select(Task).where(Task.user_id == user_id)
+    query = _SELECT_USER_TASKS
+    params = {"uid": user_id}
 
     if status_filter != "all":
         try:
-            status_enum = TaskStatus(status_filter)
-            query = query.where(Task.status == status_enum)
+            params["status"] = TaskStatus(status_filter)
+            query = _SELECT_USER_TASKS_BY_STATUS
         except ValueError:
             # Invalid status, return empty list or all tasks
             pass
 
-    tasks = db.exec(query).all()
+    tasks = (await db.exec(query, params=params)).all()
     return [TaskRead.from_orm(task) if hasattr(TaskRead, 'from_orm') else
             TaskRead(
                 id=task.id,
@@ -29,14 +41,13 @@ def get_user_tasks(db: Session, user_id: str, status_filter: str = "all") -> Lis
                 updated_at=task.updated_at
             ) for task in tasks]
 
-def get_task_by_id(db: Session, task_id: int, user_id: str) -> Optional[Task]:
+async def get_task_by_id(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
     """
     Get a specific task by ID for a user
     """
-    query = select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
-    return db.exec(query).first()
+    return (await db.exec(_SELECT_TASK_BY_ID, params={"tid": task_id, "uid": user_id})).first()
 
-def create_task_for_user(db: Session, task_data: TaskCreate, user_id: str) -> TaskRead:
+async def create_task_for_user(db: AsyncSession, task_data: TaskCreate, user_id: int) -> TaskRead:
     """
     Create a new task for a user
     """
@@ -47,8 +58,7 @@ def create_task_for_user(db: Session, task_data: TaskCreate, user_id: str) -> Ta
         user_id=user_id
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
 
     return TaskRead(
         id=task.id,
@@ -60,11 +70,11 @@ def create_task_for_user(db: Session, task_data: TaskCreate, user_id: str) -> Ta
         updated_at=task.updated_at
     )
 
-def update_task(db: Session, task_id: int, user_id: str, task_update: TaskUpdate) -> Optional[TaskRead]:
+async def update_task(db: AsyncSession, task_id: int, user_id: int, task_update: TaskUpdate) -> Optional[TaskRead]:
     """
     Update a task for a user
     """
-    task = get_task_by_id(db, task_id, user_id)
+    task = await get_task_by_id(db, task_id, user_id)
     if not task:
         return None
 
@@ -76,10 +86,8 @@ def update_task(db: Session, task_id: int, user_id: str, task_update: TaskUpdate
     if task_update.status is not None:
         task.status = task_update.status
 
-    task.updated_at = datetime.utcnow()
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
 
     return TaskRead(
         id=task.id,
@@ -91,14 +99,14 @@ def update_task(db: Session, task_id: int, user_id: str, task_update: TaskUpdate
         updated_at=task.updated_at
     )
 
-def delete_task(db: Session, task_id: int, user_id: str) -> bool:
+async def delete_task(db: AsyncSession, task_id: int, user_id: int) -> bool:
     """
     Delete a task for a user
     """
-    task = get_task_by_id(db, task_id, user_id)
+    task = await get_task_by_id(db, task_id, user_id)
     if not task:
         return False
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
     return True
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Tests for verify_token and its token cache.
+"""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+import auth
+
+
+def credentials(claims: dict) -> HTTPAuthorizationCredentials:
+    token = jwt.encode(claims, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_second_verify_is_a_cache_hit():
+    creds = credentials({"sub": "42", "exp": int(time.time()) + 60})
+    before = auth.token_cache_stats()
+
+    assert auth.verify_token(creds)["sub"] == "42"
+    assert auth.verify_token(creds)["sub"] == "42"
+
+    after = auth.token_cache_stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_expired_cache_entry_is_verified_again():
+    creds = credentials({"sub": "43", "exp": int(time.time()) + 60})
+    payload = auth.verify_token(creds)
+
+    # Age the cached payload past its exp claim
+    with auth._TOKEN_CACHE_LOCK:
+        auth._token_cache[creds.credentials] = {**payload, "exp": time.time() - 1}
+    before = auth.token_cache_stats()
+
+    assert auth.verify_token(creds) == payload
+    assert auth.token_cache_stats()["misses"] - before["misses"] == 1
+
+
+def test_expired_token_is_rejected():
+    creds = credentials({"sub": "42", "exp": int(time.time()) - 60})
+
+    with pytest.raises(HTTPException) as exc_info:
+        auth.verify_token(creds)
+    assert exc_info.value.status_code == 401
+
+
+def test_invalid_token_is_not_cached():
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="not-a-jwt")
+    size = auth.token_cache_stats()["size"]
+
+    with pytest.raises(HTTPException):
+        auth.verify_token(creds)
+    assert auth.token_cache_stats()["size"] == size
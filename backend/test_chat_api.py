@@ -0,0 +1,151 @@
+"""
+Tests for the task and chat endpoints through the ASGI app.
+
+The OpenAI client is replaced with a scripted fake: it first asks for an
+add_task tool call, then replies (or streams) a fixed answer. The tools and
+the database are real.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event
+from sqlmodel import Session, select
+
+import main
+from db import async_engine, engine
+from models.todo_models import Conversation, Message, Task, User
+
+REPLY = "Added 'Buy milk' to your list."
+
+
+class ScriptedCompletions:
+    """Stands in for client.chat.completions for one chat turn."""
+
+    async def create(self, **request):
+        if "tools" in request:
+            tool_call = SimpleNamespace(
+                id="call_1",
+                type="function",
+                function=SimpleNamespace(name="add_task", arguments=json.dumps({"title": "Buy milk"})),
+            )
+            message = SimpleNamespace(content=None, tool_calls=[tool_call])
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        if request.get("stream"):
+            return self._stream()
+        message = SimpleNamespace(content=REPLY, tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _stream(self):
+        for i in range(0, len(REPLY), 8):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=REPLY[i:i + 8]))])
+
+
+@pytest.fixture
+def user_id():
+    with Session(engine) as db:
+        user = User(email="chat_api@example.com", name="Chat API", password="hashed_password")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        yield user.id
+        conversation_ids = select(Conversation.id).where(Conversation.user_id == user.id)
+        db.exec(delete(Message).where(Message.conversation_id.in_(conversation_ids)))
+        db.exec(delete(Conversation).where(Conversation.user_id == user.id))
+        db.exec(delete(Task).where(Task.user_id == user.id))
+        db.delete(user)
+        db.commit()
+
+
+@pytest.fixture
+def client(user_id, monkeypatch):
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=ScriptedCompletions()))
+    monkeypatch.setattr(main, "get_openai_client", lambda: fake)
+    token = main.create_access_token({"sub": str(user_id), "email": "chat_api@example.com"})
+    return TestClient(main.app, headers={"Authorization": f"Bearer {token}"})
+
+
+def stored_turn(conversation_id: int):
+    with Session(engine) as db:
+        rows = db.exec(
+            select(Message.role, Message.content)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at, Message.id)
+        ).all()
+    return [(role.value, content) for role, content in rows]
+
+
+def test_task_endpoints(client):
+    created = client.post("/api/tasks", json={"title": "Write tests"})
+    assert created.status_code == 201
+    task = created.json()
+    assert task["status"] == "pending"
+    assert task["created_at"] is not None
+
+    updated = client.put(f"/api/tasks/{task['id']}", json={"status": "completed"})
+    assert updated.json()["status"] == "completed"
+    # Set by the column's onupdate and read back with the UPDATE
+    assert updated.json()["updated_at"] >= task["updated_at"]
+    assert [t["id"] for t in client.get("/api/tasks?status_filter=completed").json()] == [task["id"]]
+
+    assert client.delete(f"/api/tasks/{task['id']}").status_code == 204
+    assert client.get("/api/tasks").json() == []
+
+
+def test_task_endpoints_bind_user_id_as_int(client, user_id):
+    # The token carries the id as a str; asyncpg rejects a str for an
+    # integer parameter, while SQLite would quietly accept it
+    bound = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "tasks.user_id" in statement or "INSERT INTO tasks" in statement:
+            bound.append(parameters)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        task_id = client.post("/api/tasks", json={"title": "Typed"}).json()["id"]
+        client.get("/api/tasks")
+        client.put(f"/api/tasks/{task_id}", json={"title": "Still typed"})
+        client.delete(f"/api/tasks/{task_id}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    # Insert, list, and the ownership lookups before update and delete
+    assert len(bound) == 4
+    for parameters in bound:
+        assert user_id in parameters
+        assert str(user_id) not in parameters
+
+
+def test_chat_runs_tools_and_saves_the_turn(client):
+    response = client.post("/api/chat", json={"message": "Add a task to buy milk"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["response"] == REPLY
+    assert [t["title"] for t in client.get("/api/tasks").json()] == ["Buy milk"]
+    assert stored_turn(body["conversation_id"]) == [
+        ("user", "Add a task to buy milk"),
+        ("assistant", REPLY),
+    ]
+
+
+def test_chat_stream_sends_deltas_then_done(client):
+    response = client.post("/api/chat/stream", json={"message": "Add a task to buy milk"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.split("\n\n") if line.startswith("data: ")
+    ]
+    assert "".join(event["delta"] for event in events[:-1]) == REPLY
+    done = events[-1]
+    assert done["done"] is True
+    assert stored_turn(done["conversation_id"])[-1] == ("assistant", REPLY)
+
+
+def test_chat_rejects_a_foreign_conversation(client):
+    assert client.post("/api/chat", json={"message": "hi", "conversation_id": 999999}).status_code == 404
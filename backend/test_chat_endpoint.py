@@ -58,12 +58,13 @@ def test_message_persistence():
             "Hello, can you help me?",
             "Of course! I'm your Todo Assistant. How can I help you today?"
         )
+        db.commit()
 
         # Verify messages were saved
         messages = db.exec(
             select(Message)
             .where(Message.conversation_id == conversation.id)
-            .order_by(Message.created_at)
+            .order_by(Message.created_at, Message.id)
         ).all()
 
         print(f"\nSaved {len(messages)} messages:")
@@ -93,12 +94,13 @@ def test_history_loading(conversation_id: int):
                 f"User message {i+1}",
                 f"Assistant response {i+1}"
             )
+        db.commit()
 
         # Load last 10 messages
         messages_query = (
             select(Message)
             .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.desc())
+            .order_by(Message.created_at.desc(), Message.id.desc())
             .limit(10)
         )
         last_10_messages = db.exec(messages_query).all()
@@ -211,12 +213,13 @@ def test_chat_flow_simulation():
 
             # Save messages
             save_chat_messages(db, conversation.id, user_msg, assistant_msg)
+            db.commit()
 
         # Verify all messages saved
         all_messages = db.exec(
             select(Message)
             .where(Message.conversation_id == conversation.id)
-            .order_by(Message.created_at)
+            .order_by(Message.created_at, Message.id)
         ).all()
 
         expected_count = len(chat_exchanges) * 2  # user + assistant per exchange
@@ -227,7 +230,7 @@ def test_chat_flow_simulation():
         last_messages = db.exec(
             select(Message)
             .where(Message.conversation_id == conversation.id)
-            .order_by(Message.created_at.desc())
+            .order_by(Message.created_at.desc(), Message.id.desc())
             .limit(10)
         ).all()
 
@@ -54,7 +54,7 @@ def test_openai_tool_calling():
         content = f.read()
 
     required_elements = [
-        ("OpenAI client", r'from openai import OpenAI'),
+        ("OpenAI client", r'from openai import (Async)?OpenAI'),
         ("Tool definitions", r'get_tool_definitions'),
         ("Tool execution", r'execute_tool'),
         ("chat.completions.create", r'client\.chat\.completions\.create'),
@@ -0,0 +1,198 @@
+"""
+Tests for ConversationAgent's conversation history, summaries and tool
+batches against SQLite.
+
+The model is never called here: summaries come from a fake client. History
+is written with save_messages and read back by a fresh agent, so every load
+goes to the database.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from backend.agents.conversation_agent import MAX_RECENT_TURNS, SUMMARY_BATCH, ConversationAgent
+from backend.database.connection import engine
+from backend.models.todo_models import Conversation, Message, Task, User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def conversation_id():
+    with Session(engine) as db:
+        user = User(email="agent_history@example.com", name="Agent History", password="hashed_password")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        conversation = Conversation(user_id=user.id, title="History")
+        db.add(conversation)
+        db.commit()
+        db.refresh(conversation)
+        yield conversation.id
+        db.exec(delete(Message).where(Message.conversation_id == conversation.id))
+        db.delete(conversation)
+        db.delete(user)
+        db.commit()
+
+
+def set_summary(conversation_id: int, summary: str, summarized_count: int):
+    with Session(engine) as db:
+        conversation = db.get(Conversation, conversation_id)
+        conversation.summary = summary
+        conversation.summarized_count = summarized_count
+        db.add(conversation)
+        db.commit()
+
+
+async def test_history_loads_in_order(conversation_id):
+    await ConversationAgent().save_messages(conversation_id, [
+        ("user", "Add a task to buy milk"),
+        ("assistant", "Added 'buy milk'"),
+        ("user", "Thanks"),
+    ])
+
+    history = await ConversationAgent().load_conversation_history(conversation_id)
+
+    assert history == [
+        {"role": "user", "content": "Add a task to buy milk"},
+        {"role": "assistant", "content": "Added 'buy milk'"},
+        {"role": "user", "content": "Thanks"},
+    ]
+
+
+async def test_history_skips_summarized_messages(conversation_id):
+    await ConversationAgent().save_messages(conversation_id, [
+        ("user", "first"),
+        ("assistant", "second"),
+        ("user", "third"),
+    ])
+    set_summary(conversation_id, "The user said first and second.", 2)
+
+    history = await ConversationAgent().load_conversation_history(conversation_id)
+
+    assert history == [
+        {"role": "system", "content": "Summary of the earlier conversation: The user said first and second."},
+        {"role": "user", "content": "third"},
+    ]
+
+
+async def test_failed_tool_call_rolls_back_only_itself(conversation_id):
+    with Session(engine) as db:
+        user_id = db.get(Conversation, conversation_id).user_id
+    agent = ConversationAgent(user_id=user_id)
+
+    results = await agent.execute_tools([
+        ("add_task", {"title": "Kept before"}),
+        ("add_task", {"title": None}),
+        ("add_task", {"title": "Kept after"}),
+    ])
+
+    assert [result["success"] for result in results] == [True, False, True]
+    with Session(engine) as db:
+        titles = db.exec(select(Task.title).where(Task.user_id == user_id)).all()
+        db.exec(delete(Task).where(Task.user_id == user_id))
+        db.commit()
+    assert sorted(titles) == ["Kept after", "Kept before"]
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions, replying with a fixed summary."""
+
+    def __init__(self, reply=None, error=None):
+        self.reply = reply
+        self.error = error
+        self.requests = []
+
+    async def create(self, **request):
+        self.requests.append(request)
+        if self.error is not None:
+            raise self.error
+        message = SimpleNamespace(content=self.reply, tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fake_client(completions: FakeCompletions) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+async def save_exchanges(conversation_id: int, count: int):
+    await ConversationAgent().save_messages(conversation_id, [
+        ("user" if i % 2 == 0 else "assistant", f"message {i}") for i in range(count)
+    ])
+
+
+async def test_long_history_is_folded_into_a_summary(conversation_id):
+    await save_exchanges(conversation_id, MAX_RECENT_TURNS + SUMMARY_BATCH)
+    completions = FakeCompletions(reply="Messages 0-7 were small talk.")
+    agent = ConversationAgent()
+    agent.client = fake_client(completions)
+
+    history = await agent.load_conversation_history(conversation_id)
+
+    assert history[0] == {"role": "system", "content": "Summary of the earlier conversation: Messages 0-7 were small talk."}
+    assert [m["content"] for m in history[1:]] == [f"message {i}" for i in range(SUMMARY_BATCH, SUMMARY_BATCH + MAX_RECENT_TURNS)]
+    assert "message 0" in completions.requests[0]["messages"][1]["content"]
+
+    with Session(engine) as db:
+        conversation = db.get(Conversation, conversation_id)
+        assert conversation.summary == "Messages 0-7 were small talk."
+        assert conversation.summarized_count == SUMMARY_BATCH
+
+    # A fresh agent reads the stored summary and skips the folded messages
+    assert await ConversationAgent().load_conversation_history(conversation_id) == history
+
+
+async def test_failed_summary_keeps_the_full_history(conversation_id):
+    await save_exchanges(conversation_id, MAX_RECENT_TURNS + SUMMARY_BATCH)
+    agent = ConversationAgent()
+    agent.client = fake_client(FakeCompletions(error=RuntimeError("model unavailable")))
+
+    history = await agent.load_conversation_history(conversation_id)
+
+    assert len(history) == MAX_RECENT_TURNS + SUMMARY_BATCH
+    with Session(engine) as db:
+        assert db.get(Conversation, conversation_id).summarized_count == 0
+
+
+class FakeEmbeddings:
+    """Stands in for client.embeddings, embedding every input as the same unit vector."""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def create(self, model, input):
+        self.inputs.append(input)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, 0.0])])
+
+
+async def test_paraphrase_is_answered_from_the_semantic_cache(conversation_id):
+    completions = FakeCompletions(reply="I keep your todo list.")
+    embeddings = FakeEmbeddings()
+    agent = ConversationAgent()
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions), embeddings=embeddings)
+
+    first = await agent.run_agent("What can you help me with?", conversation_id)
+    second = await agent.run_agent("What are you able to help with?", conversation_id)
+
+    assert first["response"] == second["response"] == "I keep your todo list."
+    # The hit cancelled the router call before it went out
+    assert len(completions.requests) == 1
+    # Embedded with the normalized exchange before it
+    assert embeddings.inputs[1] == (
+        "user: what can you help me with?\n"
+        "assistant: i keep your todo list.\n"
+        "user: what are you able to help with?"
+    )
+
+    await agent.run_agent("thanks", conversation_id)
+    # Too short to embed; answered by the model
+    assert len(embeddings.inputs) == 2
+    assert len(completions.requests) == 2
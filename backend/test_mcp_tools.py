@@ -0,0 +1,76 @@
+"""
+Tests for the MCP tools as the chat endpoint calls them, through execute_tool.
+
+Each tool's JSON reply is decoded and checked, including the datetime and
+enum fields list_tasks returns.
+"""
+
+import json
+
+import pytest
+from sqlmodel import Session
+
+from db import engine
+from models.todo_models import User
+from mcp_server import execute_tool
+
+
+@pytest.fixture
+def user_id():
+    with Session(engine) as db:
+        user = User(email="mcp_tools@example.com", name="MCP Tools", password="hashed_password")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        yield user.id
+        db.delete(user)
+        db.commit()
+
+
+def call(tool_name: str, arguments: dict, user_id: int) -> dict:
+    return json.loads(execute_tool(tool_name, arguments, user_id=user_id))
+
+
+def test_each_tool(user_id):
+    added = call("add_task", {"title": "Buy milk", "description": "2 litres"}, user_id)
+    assert added["success"] is True
+    assert added["status"] == "pending"
+    task_id = added["task_id"]
+
+    listed = call("list_tasks", {"status": "pending"}, user_id)
+    assert listed["success"] is True
+    assert [task["id"] for task in listed["tasks"]] == [task_id]
+    task = listed["tasks"][0]
+    assert task["status"] == "pending"
+    assert task["created_at"] is not None
+
+    completed = call("complete_task", {"task_id": task_id}, user_id)
+    assert completed["success"] is True
+    assert completed["status"] == "completed"
+    assert call("list_tasks", {"status": "done"}, user_id)["count"] == 1
+    assert call("list_tasks", {"status": "pending"}, user_id)["count"] == 0
+
+    deleted = call("delete_task", {"task_id": task_id}, user_id)
+    assert deleted["success"] is True
+    assert deleted["title"] == "Buy milk"
+    assert call("list_tasks", {"status": "all"}, user_id)["count"] == 0
+
+
+def test_tool_errors(user_id):
+    assert call("list_tasks", {"status": "someday"}, user_id)["success"] is False
+    assert call("complete_task", {"task_id": 999999}, user_id)["success"] is False
+    assert call("delete_task", {"task_id": 999999}, user_id)["success"] is False
+
+    unknown = call("archive_task", {}, user_id)
+    assert unknown == {"success": False, "error": "Unknown tool: archive_task"}
+
+
+def test_tasks_are_scoped_to_their_user(user_id):
+    task_id = call("add_task", {"title": "Private"}, user_id)["task_id"]
+
+    other_user = user_id + 1000
+    assert call("list_tasks", {"status": "all"}, other_user)["count"] == 0
+    assert call("complete_task", {"task_id": task_id}, other_user)["success"] is False
+    assert call("delete_task", {"task_id": task_id}, other_user)["success"] is False
+
+    assert call("delete_task", {"task_id": task_id}, user_id)["success"] is True
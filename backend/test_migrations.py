@@ -0,0 +1,22 @@
+"""
+Tests for the Alembic migrations that create_tables applies at startup.
+"""
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlmodel import SQLModel
+
+from db import engine
+
+
+def test_migrated_schema_matches_models():
+    # The session fixture built the test database with create_tables()
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), SQLModel.metadata) == []
+
+
+def test_listing_and_history_indexes_exist():
+    inspector = inspect(engine)
+    assert "ix_task_user_status" in {index["name"] for index in inspector.get_indexes("tasks")}
+    assert "ix_msg_conv_created" in {index["name"] for index in inspector.get_indexes("messages")}
@@ -0,0 +1,104 @@
+"""
+Tests for TodoManagementSkill's single-statement (RETURNING) mutations and
+its per-instance task-list cache, against SQLite.
+"""
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from backend.app.skills.todo_skill import TodoManagementSkill
+from backend.database.connection import AsyncSessionLocal, engine
+from backend.models.todo_models import Task, User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def user_id():
+    with Session(engine) as db:
+        user = User(email="todo_skill@example.com", name="Todo Skill", password="hashed_password")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        yield user.id
+        db.exec(delete(Task).where(Task.user_id == user.id))
+        db.delete(user)
+        db.commit()
+
+
+async def test_mutations_return_the_changed_row(user_id):
+    async with AsyncSessionLocal() as session:
+        skill = TodoManagementSkill(session=session, user_id=user_id)
+
+        added = await skill.add_task("Buy milk", "2 litres")
+        assert added["success"] is True
+        assert added["status"] == "pending"
+        task_id = added["task_id"]
+
+        updated = await skill.update_task(task_id, title="Buy oat milk")
+        assert updated["title"] == "Buy oat milk"
+        assert updated["description"] == "2 litres"
+        assert updated["updated_fields"] == ["title"]
+
+        completed = await skill.complete_task(task_id)
+        assert completed["status"] == "completed"
+        again = await skill.complete_task(task_id)
+        assert again["success"] is True
+        assert "already" in again["message"]
+
+        deleted = await skill.delete_task(task_id)
+        assert deleted["title"] == "Buy oat milk"
+        assert (await skill.delete_task(task_id))["success"] is False
+
+
+async def test_add_tasks_inserts_in_one_statement(user_id):
+    async with AsyncSessionLocal() as session:
+        skill = TodoManagementSkill(session=session, user_id=user_id)
+
+        result = await skill.add_tasks([{"title": "One"}, {"title": "Two", "description": "second"}])
+
+        assert result["total"] == 2
+        assert [task["title"] for task in result["tasks"]] == ["One", "Two"]
+        assert (await skill.list_tasks("all"))["total"] == 2
+
+
+async def test_other_users_tasks_are_untouched(user_id):
+    async with AsyncSessionLocal() as session:
+        owner = TodoManagementSkill(session=session, user_id=user_id)
+        stranger = TodoManagementSkill(session=session, user_id=user_id + 1000)
+        task_id = (await owner.add_task("Private"))["task_id"]
+
+        assert (await stranger.update_task(task_id, title="Mine now"))["success"] is False
+        assert (await stranger.complete_task(task_id))["success"] is False
+        assert (await stranger.delete_task(task_id))["success"] is False
+        assert (await owner.list_tasks("pending"))["tasks"][0]["title"] == "Private"
+
+
+async def test_list_cache_is_invalidated_by_mutations(user_id):
+    async with AsyncSessionLocal() as session:
+        skill = TodoManagementSkill(session=session, user_id=user_id)
+        task_id = (await skill.add_task("Cached"))["task_id"]
+
+        assert (await skill.list_tasks("pending"))["total"] == 1
+        await skill.complete_task(task_id)
+        assert (await skill.list_tasks("pending"))["total"] == 0
+        completed = (await skill.list_tasks("completed"))["tasks"]
+        assert [task["id"] for task in completed] == [task_id]
+        assert completed[0]["created_at"] is not None
+
+
+async def test_uncommitted_listing_is_not_served_to_other_sessions(user_id):
+    async with AsyncSessionLocal() as session:
+        batch = TodoManagementSkill(session=session, user_id=user_id, autocommit=False)
+        await batch.add_task("Flushed only")
+        assert (await batch.list_tasks("all"))["total"] == 1
+        await session.rollback()
+
+    async with AsyncSessionLocal() as session:
+        assert (await TodoManagementSkill(session=session, user_id=user_id).list_tasks("all"))["total"] == 0